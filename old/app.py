@@ -4,12 +4,29 @@ import tempfile
 from pathlib import Path
 import pandas as pd
 import time
-import base64
+import io
 
 from ats_processor import score_resume
 from pdf_generator import generate_pdf_from_markdown
+from profiling import format_timings
 from project_manager import save_project, load_project, get_project_list
+from project_store import safe_project_name
+from resume_optimizer import optimize_resume
+from resume_history import get_resume_history
+from score_log import score_log_for
+from tfidf_cache import TfidfCache
 from utils import fetch_job_description_from_url, setup_temp_dir
+from vocab_artifact import open_vocabulary
+try:
+    from pdf2image.exceptions import (PDFPageCountError, PDFPopplerTimeoutError, PDFSyntaxError,
+                                      PopplerNotInstalledError)
+    from pdf_preview import PdfDocument
+    # Missing poppler or an unreadable PDF: no preview, download only
+    PREVIEW_ERRORS = (PopplerNotInstalledError, PDFPageCountError, PDFSyntaxError,
+                      PDFPopplerTimeoutError)
+except ImportError:  # pragma: no cover - pdf2image is optional here
+    PdfDocument = None
+    PREVIEW_ERRORS = ()
 # from streamlit_ace import st_ace
 from code_editor import code_editor
 # Page configuration
@@ -53,6 +70,81 @@ def log_message(message):
     timestamp = time.strftime("%H:%M:%S")
     st.session_state.log_messages.append(f"[{timestamp}] {message}")
 
+# Streamlit reruns this whole script on every interaction. Everything below
+# is cached across reruns and sessions, keyed by what it depends on, and
+# cleared explicitly where the app itself changes it.
+
+# Compiled with vocab_artifact.py; without it the built-in skill list is used
+SKILL_VOCAB_PATH = "cleaned.vocab"
+
+@st.cache_resource(show_spinner=False)
+def scoring_engine():
+    """Skill matcher and job-description TF-IDF cache shared by every session"""
+    skill_matcher = open_vocabulary(SKILL_VOCAB_PATH).matcher() if os.path.exists(SKILL_VOCAB_PATH) else None
+    return {"skill_matcher": skill_matcher, "tfidf_cache": TfidfCache()}
+
+@st.cache_data(show_spinner=False, ttl=60)
+def cached_project_list():
+    """Project picker entries; cleared on save, ttl catches other writers"""
+    return get_project_list()
+
+@st.cache_data(show_spinner=False, ttl=60)
+def cached_resume_versions(project_name):
+    """Resume history listing; cleared whenever this app records a version"""
+    return get_resume_history().versions(project_name)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def score_log_frame(project_name, record_count):
+    """Chart data for a score log; a new record changes record_count and the key"""
+    scores = score_log_for(project_name).read()[:record_count]
+    return pd.DataFrame({
+        "Time": pd.to_datetime(scores["timestamp"], unit="s"),
+        "Score": scores["overall"]
+    })
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def session_score_frame(score_history):
+    return pd.DataFrame({
+        "Attempt": range(len(score_history)),
+        "Score": list(score_history)
+    })
+
+# Height the preview pages are rasterized at
+PREVIEW_PAGE_HEIGHT = 1100
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def read_pdf(pdf_path, mtime_ns, size):
+    """
+    PDF bytes, read once per file version.
+
+    mtime_ns and size key the cache, so a re-render (which replaces the
+    file) is picked up and an unchanged file is never read again.
+    """
+    with open(pdf_path, "rb") as f:
+        return f.read()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def pdf_page_pngs(pdf_path, mtime_ns, size, height=PREVIEW_PAGE_HEIGHT):
+    """
+    Every page as a PNG, rasterized once per file version and height.
+
+    st.image stores each PNG in Streamlit's media storage under a hash of
+    its bytes, so reruns send the browser the same URLs and the browser
+    fetches a page only when it changed.
+    """
+    document = PdfDocument(pdf_path)
+    pages = document.render(1, document.page_count, height)
+    pngs = []
+    for page in sorted(pages):
+        buffer = io.BytesIO()
+        pages[page].save(buffer, format="PNG")
+        pngs.append(buffer.getvalue())
+    return pngs
+
+def pdf_file_key(pdf_path):
+    stat = os.stat(pdf_path)
+    return pdf_path, stat.st_mtime_ns, stat.st_size
+
 # Main title
 st.title("Resume ATS Optimizer")
 
@@ -61,7 +153,7 @@ with st.sidebar:
     st.header("Project Management")
     
     # Project selection
-    project_list = get_project_list()
+    project_list = cached_project_list()
     if project_list:
         selected_project = st.selectbox("Select Project", ["None"] + project_list)
         if selected_project != "None" and st.button("Load Project"):
@@ -96,12 +188,28 @@ with st.sidebar:
         }
         success, message = save_project(company_name, project_data)
         if success:
+            cached_project_list.clear()
+            cached_resume_versions.clear()
             st.session_state.current_project = company_name
             log_message(f"Project saved: {company_name}")
             st.success(message)
         else:
             st.error(message)
     
+    # Scored versions of the current project's resume
+    if st.session_state.current_project:
+        versions = cached_resume_versions(safe_project_name(st.session_state.current_project))
+        if versions:
+            st.subheader("Resume History")
+            version_idx = st.selectbox(
+                "Scored Versions", range(len(versions)),
+                format_func=lambda i: f"#{versions[i]['id']}: {versions[i]['score']}% ({versions[i]['created']})"
+            )
+            if st.button("Restore Version"):
+                st.session_state.resume_content = get_resume_history().checkout(versions[version_idx]["id"])
+                log_message(f"Restored resume version #{versions[version_idx]['id']}")
+                st.rerun()
+    
 
 # Create main layout with two columns
 col1, col2 = st.columns([5, 5])
@@ -169,18 +277,24 @@ with col1:
     
     with tab2:
         if st.session_state.pdf_path and os.path.exists(st.session_state.pdf_path):
-            with open(st.session_state.pdf_path, "rb") as f:
-                pdf_bytes = f.read()
+            pdf_key = pdf_file_key(st.session_state.pdf_path)
             st.download_button(
                 label="Download PDF",
-                data=pdf_bytes,
+                data=read_pdf(*pdf_key),
                 file_name="resume.pdf",
                 mime="application/pdf"
             )
-            # Display PDF using HTML iframe
-            base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-            pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="600" type="application/pdf"></iframe>'
-            st.markdown(pdf_display, unsafe_allow_html=True)
+            # Page images by URL instead of the whole PDF inlined as base64
+            pngs = None
+            if PdfDocument is not None:
+                try:
+                    pngs = pdf_page_pngs(*pdf_key)
+                except PREVIEW_ERRORS as e:
+                    log_message(f"PDF preview unavailable: {e}")
+            if pngs:
+                st.image(pngs, caption=[f"Page {i}" for i in range(1, len(pngs) + 1)])
+            else:
+                st.info("Install pdf2image (and poppler) to preview the PDF here, or download it above.")
         else:
             st.info("No PDF generated yet. Create your resume and click 'Generate PDF'.")
 
@@ -218,62 +332,127 @@ with col2:
     with score_col1:
         st.metric("Current Score", f"{st.session_state.current_score}%")
     with score_col2:
-        if st.session_state.score_history and len(st.session_state.score_history) > 1:
-            score_df = pd.DataFrame({
-                "Attempt": range(len(st.session_state.score_history)),
-                "Score": st.session_state.score_history
-            })
-            st.line_chart(score_df, x="Attempt", y="Score")
+        # A saved project charts its score log, read straight from the mapped file
+        project_name = safe_project_name(st.session_state.current_project) if st.session_state.current_project else None
+        record_count = len(score_log_for(project_name)) if project_name else 0
+        if record_count > 1:
+            st.line_chart(score_log_frame(project_name, record_count), x="Time", y="Score")
+        elif st.session_state.score_history and len(st.session_state.score_history) > 1:
+            st.line_chart(session_score_frame(tuple(st.session_state.score_history)), x="Attempt", y="Score")
     
     # Score and optimize buttons
     score_btn, optimize_btn = st.columns(2)
     
     with score_btn:
+        fidelity_check = st.checkbox(
+            "Fidelity check",
+            help="Render the PDF and score the text pdftotext extracts, instead of reading the markdown directly"
+        )
         if st.button("Score Resume"):
             if st.session_state.resume_content and st.session_state.job_desc:
                 with st.spinner("Analyzing resume..."):
-                    # Generate PDF first
-                    pdf_path = generate_pdf_from_markdown(
+                    # Fidelity mode renders the PDF first, as the "render" stage
+                    score_result = score_resume(
+                        None,
                         st.session_state.resume_content,
-                        st.session_state.temp_dir
+                        st.session_state.job_desc,
+                        mode="fidelity" if fidelity_check else "fast",
+                        output_dir=st.session_state.temp_dir,
+                        **scoring_engine()
                     )
                     
-                    if pdf_path:
-                        st.session_state.pdf_path = pdf_path
-                        # Score the resume
-                        score_result = score_resume(
-                            pdf_path, 
-                            st.session_state.resume_content,
-                            st.session_state.job_desc
-                        )
+                    if score_result["success"]:
+                        score = score_result["score"]
+                        st.session_state.current_score = score
+                        if score_result["pdf_path"]:
+                            st.session_state.pdf_path = score_result["pdf_path"]
                         
-                        if score_result["success"]:
-                            score = score_result["score"]
-                            st.session_state.current_score = score
-                            
-                            # Update score history
-                            if not st.session_state.score_history or st.session_state.score_history[-1] != score:
-                                st.session_state.score_history.append(score)
-                            
-                            # Update highest score
-                            if score > st.session_state.highest_score:
-                                st.session_state.highest_score = score
-                                log_message(f"New highest score achieved: {score}%")
-                            
-                            log_message(f"Resume scored: {score}%")
-                            st.success(f"Resume scored: {score}%")
-                            st.rerun()
-                        else:
-                            st.error(f"Scoring failed: {score_result['message']}")
+                        stage_timings = score_result["timings"]
+                        slowest = max(stage_timings, key=stage_timings.get)
+                        log_message(f"Scoring stages: {format_timings(stage_timings)} (slowest: {slowest})")
+                        extraction = score_result["extraction"]
+                        log_message(f"Text extraction ({extraction['mode']}): {format_timings(extraction['timings'])}")
+                        if "text_drift" in extraction:
+                            log_message(f"Markdown vs PDF text drift: {extraction['text_drift']:.1%}")
+                        if "profile" in score_result:
+                            log_message(f"Scoring profile:\n{score_result['profile']}")
+                        
+                        # Update score history
+                        if not st.session_state.score_history or st.session_state.score_history[-1] != score:
+                            st.session_state.score_history.append(score)
+                        
+                        # Update highest score
+                        if score > st.session_state.highest_score:
+                            st.session_state.highest_score = score
+                            log_message(f"New highest score achieved: {score}%")
+                        
+                        # Keep every scored revision of a saved project
+                        if st.session_state.current_project:
+                            details = score_result["details"]
+                            score_log_for(safe_project_name(st.session_state.current_project)).append(
+                                score, details["skill_match_score"], details["document_similarity"]
+                            )
+                            try:
+                                get_resume_history().record(
+                                    safe_project_name(st.session_state.current_project),
+                                    st.session_state.resume_content,
+                                    score
+                                )
+                                cached_resume_versions.clear()
+                            except KeyError:
+                                pass  # not saved yet
+                        
+                        log_message(f"Resume scored: {score}%")
+                        st.success(f"Resume scored: {score}%")
+                        st.rerun()
                     else:
-                        st.error("Failed to generate PDF for scoring")
+                        st.error(f"Scoring failed: {score_result['message']}")
             else:
                 st.warning("Please provide both resume content and job description")
     
     with optimize_btn:
         if st.button("Auto-Optimize Resume"):
-            st.warning("Auto-optimization will be implemented in a future update")
-            log_message("Auto-optimization requested (not yet implemented)")
+            if st.session_state.resume_content and st.session_state.job_desc:
+                project_name = safe_project_name(st.session_state.current_project) if st.session_state.current_project else None
+                progress = st.empty()
+                
+                def on_progress(message):
+                    log_message(message)
+                    progress.text(message)
+                
+                def on_best(text, score, result):
+                    # Keep the best so far in the project as the search goes
+                    if project_name:
+                        try:
+                            get_resume_history().record(project_name, text, score)
+                            score_log_for(project_name).append(
+                                score, result["skill_match_score"], result["document_similarity"]
+                            )
+                        except KeyError:
+                            pass  # not saved yet
+                
+                with st.spinner("Optimizing resume..."):
+                    optimized = optimize_resume(
+                        st.session_state.resume_content,
+                        st.session_state.job_desc,
+                        vocab_path=SKILL_VOCAB_PATH if os.path.exists(SKILL_VOCAB_PATH) else None,
+                        on_progress=on_progress,
+                        on_best=on_best
+                    )
+                cached_resume_versions.clear()
+                
+                if optimized["score"] > optimized["baseline"]:
+                    st.session_state.resume_content = optimized["text"]
+                    st.session_state.current_score = optimized["score"]
+                    st.session_state.score_history.append(optimized["score"])
+                    if optimized["score"] > st.session_state.highest_score:
+                        st.session_state.highest_score = optimized["score"]
+                    log_message(f"Added skills: {', '.join(optimized['skills'])}")
+                    st.rerun()
+                else:
+                    st.info("Optimization found nothing better")
+            else:
+                st.warning("Please provide both resume content and job description")
 
 # Display log at the bottom
 st.header("Log")
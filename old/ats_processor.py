@@ -1,54 +1,112 @@
 import os
+import time
 import subprocess
-# from simple_ats import ATS
+from difflib import SequenceMatcher
+from md_text import markdown_to_text
+from pdf_generator import generate_pdf_from_markdown
+from profiling import StageTimer
+from simple_ats import ATS
+from tfidf_cache import JD_TFIDF_CACHE
 
-def score_resume(pdf_path, resume_markdown, job_desc):
+def extract_resume_text(resume_markdown, pdf_path=None, mode="fast"):
+    """
+    Get the plain text the ATS scores.
+
+    Args:
+        resume_markdown: The markdown content of the resume
+        pdf_path: Path to the rendered PDF (only needed for "fidelity" mode)
+        mode: "fast" reads the text straight from the markdown; "fidelity"
+            runs pdftotext on the rendered PDF, like a real ATS would
+
+    Returns:
+        Tuple of (text, info) where info holds per-step timings in seconds
+        and, in fidelity mode, how far the fast text drifts from the PDF text
+    """
+    info = {"mode": mode, "timings": {}}
+
+    start = time.perf_counter()
+    fast_text = markdown_to_text(resume_markdown)
+    info["timings"]["markdown_text"] = time.perf_counter() - start
+
+    if mode == "fast":
+        return fast_text, info
+
+    if mode != "fidelity":
+        raise ValueError(f"Unknown scoring mode: {mode}")
+    if not pdf_path:
+        raise ValueError("Fidelity mode needs a rendered PDF")
+
+    # Extract text from PDF
+    start = time.perf_counter()
+    txt_path = pdf_path.replace('.pdf', '.txt')
+    subprocess.call(["pdftotext", pdf_path, txt_path])
+    with open(txt_path, "r") as f:
+        pdf_text = f.read()
+    info["timings"]["pdftotext"] = time.perf_counter() - start
+
+    # 0.0 means both paths produce the same words in the same order
+    fast_words = fast_text.lower().split()
+    pdf_words = pdf_text.lower().split()
+    info["text_drift"] = 1 - SequenceMatcher(None, fast_words, pdf_words, autojunk=False).ratio()
+
+    return pdf_text, info
+
+def score_resume(pdf_path, resume_markdown, job_desc, mode="fast", output_dir=None, profile=None,
+                 skill_matcher=None, tfidf_cache=None):
     """
     Score a resume against a job description using ATS.
-    
+
     Args:
-        pdf_path: Path to the generated PDF
+        pdf_path: Path to the generated PDF (may be None in "fast" mode)
         resume_markdown: The markdown content of the resume
         job_desc: The job description text
-        
+        mode: "fast" or "fidelity", see extract_resume_text
+        output_dir: In "fidelity" mode without a pdf_path, render the PDF
+            into this directory first (timed as the "render" stage)
+        profile: Run the stages under cProfile (None reads RESUME_ATS_PROFILE)
+        skill_matcher: Skill vocabulary matcher (None for the built-in skills)
+        tfidf_cache: TfidfCache for the job description (None for the shared one)
+
     Returns:
-        Dict with success status, score and message
+        Dict with success status, score (percent), details from
+        ATS.calculate_detailed_score, extraction info, pdf_path, per-stage
+        timings in seconds and, when profiling, the profile as text; or
+        success False and a message
     """
+    timer = StageTimer(profile)
     try:
-        # Extract text from PDF
-        txt_path = pdf_path.replace('.pdf', '.txt')
-        subprocess.call(["pdftotext", pdf_path, txt_path])
-        
-        # Read text content
-        with open(txt_path, "r") as f:
-            resume_content = f.read()
-            
+        if mode == "fidelity" and not pdf_path and output_dir:
+            with timer.stage("render"):
+                pdf_path = generate_pdf_from_markdown(resume_markdown, output_dir)
+            if not pdf_path:
+                raise RuntimeError("PDF generation failed")
+
+        with timer.stage("extract"):
+            resume_content, extract_info = extract_resume_text(resume_markdown, pdf_path, mode)
+
         # Score with ATS
-        # ats = ATS()
-        # ats.load_resume(resume_content)
-        # ats.load_job_description(job_desc)
-        # ats.clean_jd()
-        
-        # experience = ats.extract_experience()
-        # ats.clean_experience(experience)
-        
-        # skills = " ".join(ats.extract_skills())
-        # ats.clean_skills(skills)
-        
-        # similarity_score = ats.calculate_detailed_score()
-        # score = round(similarity_score["overall_score"] * 100, 2)
-        
-        score = 10
-        similarity_score = 20
-        
-        return {
+        ats = ATS(skill_matcher, tfidf_cache if tfidf_cache is not None else JD_TFIDF_CACHE)
+        ats.load_resume(resume_content)
+        ats.load_job_description(job_desc)
+        ats.clean_jd()
+
+        details = ats.calculate_detailed_score(timer)
+        score = round(details["overall_score"] * 100, 2)
+
+        result = {
             "success": True,
             "score": score,
-            "details": similarity_score
+            "details": details,
+            "extraction": extract_info,
+            "pdf_path": pdf_path,
+            "timings": timer.timings
         }
-    
+        if timer.profiler is not None:
+            result["profile"] = timer.profile_stats()
+        return result
+
     except Exception as e:
         return {
             "success": False,
             "message": str(e)
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,155 @@
+"""
+Background jobs for the Tk app.
+
+Rendering (WeasyPrint/pandoc), pdftotext, TF-IDF scoring and pdf2image
+rasterization used to run on the Tk main thread, freezing the window for
+seconds at a time. JobRunner runs them on its own executor instead and
+hands results back on the Tk thread: workers only put finished jobs on a
+queue, and the main thread drains it from an after() callback, so no
+widget is ever touched from a worker.
+
+Jobs go into named channels, and each channel is latest-wins. Submitting
+a job supersedes whatever is still queued or running in its channel: a
+queued job never starts, a running one sees its CancelToken cancelled (and
+can stop at its next check()), and either way its result is dropped. A
+burst of edits therefore costs at most the job in flight plus the newest
+one.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# How often the Tk thread looks for finished jobs while any are pending
+POLL_MS = 30
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that has been superseded"""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise JobCancelled if the job has been superseded"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class JobRunner:
+    """
+    Latest-wins background jobs with results delivered on the Tk thread.
+
+    Args:
+        widget: Any Tk widget; its after() schedules result delivery
+        name: Name prefix for the worker threads
+        max_workers: Worker threads; with 1, jobs never run concurrently,
+            so they can share the app's temp directory and state
+    """
+
+    def __init__(self, widget, name="jobs", max_workers=1):
+        self.widget = widget
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._calls = queue.Queue()  # callables for the Tk thread
+        self._latest = {}  # channel -> (generation, token, future)
+        self._generation = 0
+        self._pending = 0
+        self._polling = False
+
+    def submit(self, channel, fn, *args, on_done=None, on_error=None):
+        """
+        Run fn(token, *args) in the background, superseding the channel's
+        previous job.
+
+        Args:
+            channel: Name of the channel ("score", "pdf", ...)
+            fn: The job; gets a CancelToken first, then args
+            on_done: Called with fn's return value on the Tk thread
+            on_error: Called with the exception on the Tk thread
+
+        The callbacks only run if the job is still the channel's latest.
+
+        Returns:
+            The job's CancelToken
+        """
+        self.cancel(channel)
+        self._generation += 1
+        generation = self._generation
+        token = CancelToken()
+
+        def run():
+            token.check()
+            return fn(token, *args)
+
+        future = self.executor.submit(run)
+        self._latest[channel] = (generation, token, future)
+        self._pending += 1
+        future.add_done_callback(
+            lambda f: self._calls.put(lambda: self._deliver(channel, generation, f, on_done, on_error))
+        )
+        self._poll_soon()
+        return token
+
+    def cancel(self, channel):
+        """Supersede the channel's job without submitting a new one"""
+        entry = self._latest.pop(channel, None)
+        if entry is not None:
+            _, token, future = entry
+            token.cancel()
+            future.cancel()
+
+    def busy(self, channel):
+        return channel in self._latest
+
+    def call_soon(self, fn, *args):
+        """
+        Run fn(*args) on the Tk thread; safe to call from a job.
+
+        Used by long jobs to report progress before they finish.
+        """
+        self._calls.put(lambda: fn(*args))
+
+    def _poll_soon(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_MS, self._drain)
+
+    def _drain(self):
+        self._polling = False
+        try:
+            while True:
+                try:
+                    call = self._calls.get_nowait()
+                except queue.Empty:
+                    break
+                call()
+        finally:
+            if self._pending:
+                self._poll_soon()
+
+    def _deliver(self, channel, generation, future, on_done, on_error):
+        self._pending -= 1
+        latest = self._latest.get(channel)
+        if latest is None or latest[0] != generation or future.cancelled():
+            return
+        del self._latest[channel]
+        error = future.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(future.result())
+        elif not isinstance(error, JobCancelled) and on_error is not None:
+            on_error(error)
+
+    def shutdown(self):
+        """Cancel everything; running jobs finish in the background and are dropped"""
+        for channel in list(self._latest):
+            self.cancel(channel)
+        self.executor.shutdown(wait=False, cancel_futures=True)
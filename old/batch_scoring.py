@@ -0,0 +1,166 @@
+"""
+Vectorized scoring of one document against many.
+
+score_many() scores one resume against a whole feed of job descriptions and
+rank_resumes() does the reverse. Both tokenize every document once into a
+single sparse count matrix and match skills into a single sparse incidence
+matrix, then compute every score with matrix products. The numbers are the
+same ones ATS.calculate_detailed_score gives for each pair on its own.
+"""
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from simple_ats import ATS, DEFAULT_SKILL_MATCHER
+from tfidf_cache import IDF_SHARED, IDF_SINGLE
+
+
+def _pair_cosines(counts, one, many):
+    """
+    Cosine of the two-document TF-IDF fit between row `one` and each of `many`.
+
+    See tfidf_cache.pair_cosine; this is the same algebra on a count matrix.
+    """
+    one_row = counts[one]
+    others = counts[many]
+    single_sq = IDF_SINGLE ** 2
+    shared_sq = IDF_SHARED ** 2
+
+    # Shared terms carry idf 1 on both sides, so the dot product is on raw counts
+    dot = np.asarray(others @ one_row.T.toarray()).ravel()
+
+    # Each side's squared norm: idf^2 is 1 on shared terms, single_sq elsewhere
+    one_present = (one_row.toarray().ravel() > 0)
+    weights = np.where(one_present, shared_sq, single_sq)
+    others_sq = np.asarray(others.multiply(others) @ weights).ravel()
+
+    one_sq_by_term = one_row.multiply(one_row).toarray().ravel()
+    others_binary = others.copy()
+    others_binary.data[:] = 1
+    shared_one_sq = np.asarray(others_binary @ one_sq_by_term).ravel()
+    one_sq = single_sq * one_sq_by_term.sum() - (single_sq - shared_sq) * shared_one_sq
+
+    denom = np.sqrt(one_sq * others_sq)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(dot > 0, dot / denom, 0.0)
+
+
+def _count_matrix(documents):
+    """Sparse term-count matrix, or None when no document has any terms"""
+    vectorizer = CountVectorizer(stop_words='english')
+    try:
+        return vectorizer.fit_transform(documents).tocsr()
+    except ValueError:
+        # Empty vocabulary: every similarity is zero
+        return None
+
+
+def _jd_skill_ids(job_desc, matcher, ats):
+    """Skill ids for a job description, from its requirements section if it has one"""
+    ats.load_job_description(job_desc)
+    ats.clean_jd()
+    return list(dict.fromkeys(term_id for _, _, term_id in matcher.find_spans(ats.requirements_text())))
+
+
+def _incidence(id_lists, n_terms):
+    """Binary (documents x skills) CSR matrix from per-document skill id lists"""
+    indptr = np.zeros(len(id_lists) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ids) for ids in id_lists])
+    indices = np.fromiter((i for ids in id_lists for i in ids), dtype=np.int64, count=indptr[-1])
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(id_lists), n_terms))
+
+
+def _results(overall, skill_match, cosine, totals, matched, required_ids, have_ids, matcher, details):
+    """Per-pair result dicts; required_ids/have_ids hold one skill id collection per pair"""
+    results = []
+    for i in range(len(overall)):
+        result = {
+            'overall_score': float(overall[i]),
+            'skill_match_score': float(skill_match[i]),
+            'document_similarity': float(cosine[i]),
+            'total_skills_required': int(totals[i]),
+            'skills_matched': int(matched[i]),
+        }
+        if details:
+            result['matched_skills'] = [matcher.term(t) for t in required_ids[i] if t in have_ids[i]]
+            result['missing_skills'] = [matcher.term(t) for t in required_ids[i] if t not in have_ids[i]]
+        results.append(result)
+    return results
+
+
+def score_many(resume, job_descs, skill_matcher=None, details=True):
+    """
+    Score one resume against many job descriptions.
+
+    Args:
+        resume: Resume text
+        job_descs: List of job description texts
+        skill_matcher: SkillMatcher/MappedSkillMatcher to use (defaults to the ATS built-ins)
+        details: Include matched_skills/missing_skills lists in each result
+
+    Returns:
+        List of result dicts in job_descs order, with the same keys as
+        ATS.calculate_detailed_score
+    """
+    matcher = skill_matcher or DEFAULT_SKILL_MATCHER
+    n = len(job_descs)
+    if n == 0:
+        return []
+
+    ats = ATS(skill_matcher=matcher)
+    jd_ids = [_jd_skill_ids(jd, matcher, ats) for jd in job_descs]
+    resume_ids = matcher.find_ids(resume)
+
+    required = _incidence(jd_ids, len(matcher))
+    have = np.zeros(len(matcher))
+    have[list(resume_ids)] = 1.0
+    totals = np.asarray(required.sum(axis=1)).ravel()
+    matched = required @ have
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skill_match = np.where(totals > 0, matched / totals, 0.0)
+
+    counts = _count_matrix([resume] + list(job_descs))
+    cosine = np.zeros(n) if counts is None else _pair_cosines(counts, 0, slice(1, None))
+
+    overall = 0.7 * skill_match + 0.3 * cosine
+    return _results(overall, skill_match, cosine, totals, matched,
+                    jd_ids, [resume_ids] * n, matcher, details)
+
+
+def rank_resumes(job_desc, resumes, skill_matcher=None, details=True):
+    """
+    Score many resumes against one job description, best first.
+
+    Args:
+        job_desc: Job description text
+        resumes: List of resume texts
+        skill_matcher: SkillMatcher/MappedSkillMatcher to use (defaults to the ATS built-ins)
+        details: Include matched_skills/missing_skills lists in each result
+
+    Returns:
+        List of (resume index, result dict) sorted by overall_score, highest first
+    """
+    matcher = skill_matcher or DEFAULT_SKILL_MATCHER
+    n = len(resumes)
+    if n == 0:
+        return []
+
+    jd_ids = _jd_skill_ids(job_desc, matcher, ATS(skill_matcher=matcher))
+    resume_ids = [matcher.find_ids(resume) for resume in resumes]
+
+    have = _incidence([list(ids) for ids in resume_ids], len(matcher))
+    required = np.zeros(len(matcher))
+    required[jd_ids] = 1.0
+    total = len(jd_ids)
+    matched = have @ required
+    skill_match = matched / total if total else np.zeros(n)
+
+    counts = _count_matrix([job_desc] + list(resumes))
+    cosine = np.zeros(n) if counts is None else _pair_cosines(counts, 0, slice(1, None))
+
+    overall = 0.7 * skill_match + 0.3 * cosine
+    results = _results(overall, skill_match, cosine, np.full(n, total), matched,
+                       [jd_ids] * n, resume_ids, matcher, details)
+    order = np.argsort(-overall, kind="stable")
+    return [(int(i), results[i]) for i in order]
@@ -0,0 +1,83 @@
+"""
+Benchmark job-description extraction on the saved posting pages in
+bench_html/: the old BeautifulSoup tree + CSS select against the streaming
+extractor backends, with parity of each backend's text against the old one,
+plus the site-specific extractor each page's host would get and how much
+text it keeps.
+
+The pages are trimmed stand-ins for common job-board layouts (Workday,
+Greenhouse, Lever, LinkedIn, Indeed, a generic careers page, an ASP.NET
+page wrapped in one big <form>, a page with no known container and a
+deliberately malformed one), scripts and styles included, since those dominate real page sizes.
+
+Usage:
+    python bench_extract.py [repeats]
+"""
+import glob
+import os
+import statistics
+import sys
+import time
+
+from html_extract import BACKENDS, extract_job_description, extract_with_bs4
+from site_extractors import extract_for_url, extractor_for_url
+
+# Where each saved page would have been fetched from
+PAGE_URLS = {
+    "workday.html": "https://acme.wd5.myworkdayjobs.com/en-US/careers/job/Moline-IL/Software-Developer-Intern_R001",
+    "greenhouse.html": "https://boards.greenhouse.io/acme/jobs/4012345",
+    "lever.html": "https://jobs.lever.co/acme/6f1c2d3e-data-scientist-ii",
+    "linkedin.html": "https://www.linkedin.com/jobs/view/3812345678",
+    "indeed.html": "https://www.indeed.com/viewjob?jk=0a1b2c3d4e5f",
+}
+
+
+def time_call(func, html, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_html", "*.html")))
+    if not pages:
+        print("No pages found in bench_html/")
+        return
+
+    backends = sorted(BACKENDS)
+    print(f"{'page':<22}{'KB':>6}{'bs4 ms':>9}" + "".join(f"{b + ' ms':>11}{'same':>6}" for b in backends)
+          + f"{'site':>12}{'site ms':>9}{'chars':>13}")
+    totals = {name: 0.0 for name in ["bs4"] + backends + ["site"]}
+    for path in pages:
+        with open(path, "r") as f:
+            html = f.read()
+        reference = extract_with_bs4(html)
+        bs4_time = time_call(extract_with_bs4, html, repeats)
+        totals["bs4"] += bs4_time
+        row = f"{os.path.basename(path):<22}{len(html) / 1024:>6.0f}{bs4_time * 1000:>9.2f}"
+        for backend in backends:
+            func = lambda page: extract_job_description(page, backend)
+            elapsed = time_call(func, html, repeats)
+            totals[backend] += elapsed
+            same = "yes" if func(html) == reference else "NO"
+            row += f"{elapsed * 1000:>11.2f}{same:>6}"
+
+        url = PAGE_URLS.get(os.path.basename(path), "https://careers.example.com/jobs/1")
+        site_func = lambda page: extract_for_url(page, url)
+        elapsed = time_call(site_func, html, repeats)
+        totals["site"] += elapsed
+        chars = f"{len(reference)}->{len(site_func(html))}"
+        row += f"{extractor_for_url(url).name:>12}{elapsed * 1000:>9.2f}{chars:>13}"
+        print(row)
+
+    print(f"{'total':<28}{totals['bs4'] * 1000:>9.2f}"
+          + "".join(f"{totals[b] * 1000:>11.2f}{'':>6}" for b in backends)
+          + f"{'':>12}{totals['site'] * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark per-render latency of the PDF backends: pandoc as a subprocess
+against WeasyPrint kept warm in-process. The render cache is bypassed so
+every iteration is a real render.
+
+Usage:
+    python bench_render.py [repeats]
+"""
+import glob
+import statistics
+import sys
+import tempfile
+import time
+
+import pdf_generator
+from pdf_generator import generate_pdf_from_markdown
+
+
+def bench_backend(backend, resumes, repeats, temp_dir):
+    timings = []
+    for resume in resumes:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            if not generate_pdf_from_markdown(resume, temp_dir, use_cache=False, backend=backend):
+                return None
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    resumes = []
+    for path in sorted(glob.glob("projects/*/resume.md")):
+        with open(path, "r") as f:
+            resumes.append(f.read())
+    if not resumes:
+        print("No sample resumes found in projects/*/resume.md")
+        return
+
+    backends = ["pandoc"]
+    if pdf_generator.weasyprint is not None:
+        backends.append("weasyprint")
+    else:
+        print("weasyprint is not importable in-process; only timing pandoc")
+
+    temp_dir = tempfile.mkdtemp()
+    print(f"{len(resumes)} resumes, {repeats} renders each")
+    print(f"{'backend':<12}{'first ms':>10}{'median ms':>11}{'mean ms':>10}")
+    for backend in backends:
+        timings = bench_backend(backend, resumes, repeats, temp_dir)
+        if not timings:
+            print(f"{backend:<12}failed")
+            continue
+        print(f"{backend:<12}{timings[0] * 1000:>10.0f}{statistics.median(timings) * 1000:>11.0f}"
+              f"{statistics.mean(timings) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark scoring one candidate resume: the full score_resume pipeline
+(fast mode, no PDF) against the fast_scoring.score_text path with a
+prepared job description, and check that both give the same score.
+
+Usage:
+    python bench_score.py [resume.md] [repeats]
+"""
+import glob
+import sys
+import time
+
+from ats_processor import score_resume
+from fast_scoring import prepare_job_description, score_text
+from md_text import markdown_to_text
+
+
+def per_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    resume_path = sys.argv[1] if len(sys.argv) > 1 else "resumeTemplate.md"
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with open(resume_path, "r") as f:
+        resume = f.read()
+    job_descs = []
+    for path in sorted(glob.glob("projects/*/job_description.md")):
+        with open(path, "r") as f:
+            job_descs.append((path, f.read()))
+    if not job_descs:
+        print("No sample job descriptions found in projects/*/job_description.md")
+        return
+
+    resume_text = markdown_to_text(resume)
+    print(f"{resume_path}, {repeats} repeats per job description")
+    print(f"{'job description':<40}{'pipeline ms':>12}{'prepare ms':>12}{'score_text ms':>15}"
+          f"{'per minute':>12}{'same':>6}")
+    for path, job_desc in job_descs:
+        pipeline = per_call(lambda: score_resume(None, resume, job_desc), repeats)
+        prepare = per_call(lambda: prepare_job_description(job_desc), repeats)
+        jd = prepare_job_description(job_desc)
+        fast = per_call(lambda: score_text(resume_text, jd), repeats)
+        same = abs(score_resume(None, resume, job_desc)["details"]["overall_score"]
+                   - score_text(resume_text, jd)["overall_score"]) < 1e-9
+        print(f"{path[-40:]:<40}{pipeline * 1000:>12.2f}{prepare * 1000:>12.2f}{fast * 1000:>15.3f}"
+              f"{60 / fast:>12.0f}{'yes' if same else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark skill extraction: the old per-skill substring loop against the
+precompiled SkillMatcher automaton.
+
+Usage:
+    python bench_skills.py [repeats]
+"""
+import glob
+import sys
+import time
+
+from simple_ats import TECH_SKILLS, SOFT_SKILLS
+from skill_matcher import SkillMatcher, load_vocabulary
+
+
+def substring_loop(skills, text):
+    """The original ATS.extract_skills_from_text strategy"""
+    text_lower = text.lower()
+    return list(set(skill for skill in skills if skill in text_lower))
+
+
+def time_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    job_descs = []
+    for path in sorted(glob.glob("projects/*/job_description.md")):
+        with open(path, "r") as f:
+            job_descs.append(f.read())
+    if not job_descs:
+        print("No sample job descriptions found in projects/*/job_description.md")
+        return
+
+    vocabularies = [("built-in", TECH_SKILLS + SOFT_SKILLS)]
+    for path in ["cleaned.txt", "keywords.txt"]:
+        try:
+            vocabularies.append((path, load_vocabulary(path)))
+        except FileNotFoundError:
+            print(f"Skipping missing vocabulary {path}")
+
+    print(f"{len(job_descs)} job descriptions, {repeats} repeats each")
+    print(f"{'vocabulary':<14}{'terms':>8}{'build ms':>10}{'loop ms':>10}{'automaton ms':>14}{'speedup':>9}")
+    for name, terms in vocabularies:
+        start = time.perf_counter()
+        matcher = SkillMatcher(terms)
+        build = time.perf_counter() - start
+
+        loop = sum(time_call(lambda: substring_loop(matcher.terms, jd), repeats) for jd in job_descs)
+        automaton = sum(time_call(lambda: matcher.find_skills(jd), repeats) for jd in job_descs)
+        print(f"{name:<14}{len(matcher):>8}{build * 1000:>10.1f}{loop * 1000:>10.2f}"
+              f"{automaton * 1000:>14.2f}{loop / automaton:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
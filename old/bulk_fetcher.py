@@ -0,0 +1,276 @@
+"""
+Bulk job-description fetcher built on asyncio and aiohttp.
+
+utils.fetch_job_description_from_url makes one blocking request per URL.
+fetch_many() instead runs every URL through a single aiohttp session whose
+connector keeps connections alive and pools them, caps how many requests
+hit one host at once and how often they start, and retries timeouts,
+connection errors, 429 and 5xx responses with exponential backoff (honouring
+Retry-After). Results are yielded as soon as each page is parsed, so
+fetch_into_projects() can write projects while the rest are still in flight.
+
+Usage:
+    python bulk_fetcher.py urls.txt [per_host] [rate_per_host]
+"""
+import asyncio
+import random
+import re
+import sys
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from project_manager import load_project, save_project
+from site_extractors import extract_for_url
+
+FetchResult = namedtuple("FetchResult", ["url", "success", "text", "status", "attempts"])
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) resume-ats bulk fetcher"
+
+
+class HostLimiter:
+    """
+    Concurrency and request-rate cap for one host.
+
+    Args:
+        concurrency: Requests allowed in flight at once
+        rate: Requests allowed to start per second (None for no limit)
+    """
+
+    def __init__(self, concurrency, rate=None):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        if self.interval:
+            # Hand out evenly spaced start slots
+            async with self._lock:
+                now = time.monotonic()
+                start = max(now, self.next_start)
+                self.next_start = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+def _retry_delay(attempt, backoff, retry_after=None):
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    # Exponential backoff with jitter so retries from many tasks don't line up
+    return backoff * (2 ** attempt) * (0.5 + random.random())
+
+
+async def fetch_one(session, url, limiter, retries=3, backoff=0.5):
+    """
+    Fetch one posting and extract its description.
+
+    Args:
+        session: The shared aiohttp.ClientSession
+        url: The URL to fetch
+        limiter: HostLimiter for the URL's host
+        retries: Extra attempts after a retryable failure
+        backoff: Base delay in seconds, doubled on each retry
+
+    Returns:
+        FetchResult; text is the description, or the error message on failure
+    """
+    loop = asyncio.get_running_loop()
+    message = ""
+    status = None
+    for attempt in range(retries + 1):
+        retry_after = None
+        try:
+            async with limiter:
+                async with session.get(url) as response:
+                    status = response.status
+                    if status == 200:
+                        html = await response.text(errors="replace")
+                    else:
+                        retry_after = response.headers.get("Retry-After")
+                        await response.read()
+            if status == 200:
+                # Parsing is CPU bound; keep it off the event loop. A page
+                # the extractor chokes on fails this URL, not the whole run
+                try:
+                    text = await loop.run_in_executor(None, extract_for_url, html, url)
+                except Exception as e:
+                    return FetchResult(url, False, f"Error extracting job description: {e!r}",
+                                       status, attempt + 1)
+                if not text.strip():
+                    return FetchResult(url, False, "No job description text found on the page",
+                                       status, attempt + 1)
+                return FetchResult(url, True, text, status, attempt + 1)
+            message = f"Failed to fetch job description. Status code: {status}"
+            if status not in RETRY_STATUSES:
+                return FetchResult(url, False, message, status, attempt + 1)
+        except ValueError as e:
+            # aiohttp.InvalidURL, or yarl rejecting the URL; retrying can't fix it
+            return FetchResult(url, False, f"Invalid job posting URL: {e}", None, attempt + 1)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = None
+            message = f"Error fetching job description: {e!r}"
+        if attempt < retries:
+            await asyncio.sleep(_retry_delay(attempt, backoff, retry_after))
+    return FetchResult(url, False, message, status, retries + 1)
+
+
+async def _invalid_url(url, error):
+    return FetchResult(url, False, f"Invalid job posting URL: {error}", None, 1)
+
+
+def make_session(total_connections=100, per_host=4, timeout=20):
+    """Create a ClientSession with a pooled keep-alive connector"""
+    if aiohttp is None:
+        raise RuntimeError("Bulk fetching needs aiohttp: pip install aiohttp")
+    connector = aiohttp.TCPConnector(
+        limit=total_connections,
+        limit_per_host=per_host,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+async def fetch_many(urls, per_host=4, rate_per_host=2.0, total_connections=100,
+                     timeout=20, retries=3, backoff=0.5, session=None):
+    """
+    Fetch many postings concurrently, yielding results as they complete.
+
+    Args:
+        urls: Iterable of URLs; duplicates are fetched once
+        per_host: Requests in flight per host
+        rate_per_host: Requests started per second per host (None for no limit)
+        total_connections: Connection pool size across all hosts
+        timeout: Total seconds allowed per request
+        retries: Extra attempts for timeouts, connection errors, 429 and 5xx
+        backoff: Base retry delay in seconds
+        session: An existing aiohttp.ClientSession to use (not closed here)
+
+    Yields:
+        FetchResult tuples in completion order
+    """
+    urls = list(dict.fromkeys(urls))
+    own_session = session is None
+    if own_session:
+        session = make_session(total_connections, per_host, timeout)
+
+    limiters = {}
+    tasks = set()
+    try:
+        for url in urls:
+            try:
+                host = urlsplit(url).netloc.lower()
+            except ValueError as e:
+                tasks.add(asyncio.ensure_future(_invalid_url(url, e)))
+                continue
+            limiter = limiters.get(host)
+            if limiter is None:
+                limiter = limiters[host] = HostLimiter(per_host, rate_per_host)
+            tasks.add(asyncio.ensure_future(fetch_one(session, url, limiter, retries, backoff)))
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        if own_session:
+            await session.close()
+
+
+def project_name_for_url(url):
+    """Project name for a posting: host plus the last path segment"""
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [s for s in parts.path.split("/") if s]
+    name = host + ("_" + segments[-1] if segments else "")
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name)[:100]
+
+
+def save_fetched_description(url, text):
+    """
+    Store a fetched description in its project, creating it if needed.
+
+    An existing project keeps its resume and score history; only the job
+    description and URL are replaced.
+
+    Returns:
+        Tuple of (success, message) from save_project
+    """
+    name = project_name_for_url(url)
+    _, _, data = load_project(name)
+    data["job_desc"] = text
+    data["job_url"] = url
+    return save_project(name, data)
+
+
+async def fetch_into_projects_async(urls, on_result=None, **kwargs):
+    """
+    Fetch postings and save each one into projects as it arrives.
+
+    Args:
+        urls: Iterable of URLs
+        on_result: Optional callback(result, saved, message) per URL
+        **kwargs: Passed to fetch_many
+
+    Returns:
+        Dict with 'saved' and 'failed' counts
+    """
+    counts = {"saved": 0, "failed": 0}
+    async for result in fetch_many(urls, **kwargs):
+        if result.success:
+            saved, message = save_fetched_description(result.url, result.text)
+        else:
+            saved, message = False, result.text
+        counts["saved" if saved else "failed"] += 1
+        if on_result:
+            on_result(result, saved, message)
+    return counts
+
+
+def fetch_into_projects(urls, on_result=None, **kwargs):
+    """Blocking wrapper around fetch_into_projects_async"""
+    return asyncio.run(fetch_into_projects_async(urls, on_result, **kwargs))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+    with open(sys.argv[1], "r") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    kwargs = {}
+    if len(sys.argv) > 2:
+        kwargs["per_host"] = int(sys.argv[2])
+    if len(sys.argv) > 3:
+        kwargs["rate_per_host"] = float(sys.argv[3])
+
+    def report(result, saved, message):
+        print(f"{'ok ' if saved else 'ERR'} {result.url} ({result.attempts} attempt(s)): {message}")
+
+    start = time.perf_counter()
+    counts = fetch_into_projects(urls, report, **kwargs)
+    print(f"{counts['saved']} saved, {counts['failed']} failed in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,4 +38,8 @@ data.sort(key=len, reverse=True)
 # write data to a file seperated by a new line
 f2 = open('cleaned.txt', 'w')
 f2.write('\n'.join(data))
-f2.close()
\ No newline at end of file
+f2.close()
+
+# compile the list into the mmap-able artifact the scorer loads
+from vocab_artifact import build_artifact
+build_artifact(['cleaned.txt'], 'cleaned.vocab')
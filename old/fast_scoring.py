@@ -0,0 +1,82 @@
+"""
+Score-only fast path for optimization loops.
+
+score_resume renders the PDF (in fidelity mode), extracts text, builds an
+ATS, re-splits the job description into sections, re-scans it for skills
+and looks up its TF-IDF terms on every call. For a loop that scores
+thousands of candidates against one job description, everything on the
+job side only needs doing once. prepare_job_description() does it up
+front and returns a JobDescriptionHandle (cleaned text, sections,
+requirements, required skill ids and TF-IDF terms). score_text() then
+does just the resume's side: one automaton scan for skills, one
+tokenization and the closed-form two-document cosine
+(tfidf_cache.pair_cosine). There is no rendering and no vectorizer fit.
+The result is the same dict ATS.calculate_detailed_score returns.
+
+Render only the candidate you keep:
+
+    jd = prepare_job_description(job_desc)
+    best = max(candidates, key=lambda text: score_text(text, jd)["overall_score"])
+"""
+from simple_ats import ATS
+from tfidf_cache import JobDescriptionTerms, pair_cosine, term_counts
+
+
+class JobDescriptionHandle:
+    """
+    A job description prepared once for scoring many resumes.
+
+    Args:
+        job_desc: The job description text
+        skill_matcher: Matcher to use (defaults to the ATS built-ins)
+    """
+
+    def __init__(self, job_desc, skill_matcher=None):
+        ats = ATS(skill_matcher=skill_matcher)
+        ats.load_job_description(job_desc)
+        ats.clean_jd()
+        self.job_desc = job_desc
+        self.text = ats.job_description
+        self.matcher = ats.skill_matcher
+        self.sections = ats.identify_sections()
+        # Same rule as ATS.requirements_text, without splitting again
+        requirements = [self.text[s.start:s.end] for s in self.sections if s.name == "requirements"]
+        self.requirements = "\n".join(requirements) if requirements else self.text
+        # Required skill ids in order of first appearance, like find_skills
+        self.required = list(dict.fromkeys(
+            term_id for _, _, term_id in self.matcher.find_spans(self.requirements)
+        ))
+        self.required_set = frozenset(self.required)
+        self.terms = JobDescriptionTerms(self.text)
+
+
+def prepare_job_description(job_desc, skill_matcher=None):
+    return JobDescriptionHandle(job_desc, skill_matcher)
+
+
+def score_text(resume_text, jd_handle):
+    """
+    Score plain resume text against a prepared job description.
+
+    Args:
+        resume_text: The resume as plain text (see md_text.markdown_to_text)
+        jd_handle: JobDescriptionHandle from prepare_job_description
+
+    Returns:
+        Dict with the keys of ATS.calculate_detailed_score, same values
+    """
+    matcher = jd_handle.matcher
+    have = matcher.find_ids(resume_text)
+    required = jd_handle.required
+    matched = [term_id for term_id in required if term_id in have]
+    skill_match = len(matched) / len(required) if required else 0
+    cosine_sim = pair_cosine(term_counts(resume_text), jd_handle.terms)
+    return {
+        'overall_score': float(0.7 * skill_match + 0.3 * cosine_sim),
+        'skill_match_score': skill_match,
+        'document_similarity': float(cosine_sim),
+        'matched_skills': [matcher.term(t) for t in matched],
+        'missing_skills': [matcher.term(t) for t in required if t not in have],
+        'total_skills_required': len(required),
+        'skills_matched': len(matched)
+    }
@@ -109,4 +109,8 @@ fcl.close()
 # write data to a file seperated by a new line
 f2 = open('keywords.txt', 'w')
 f2.write('\n'.join(data))
-f2.close()
\ No newline at end of file
+f2.close()
+
+# compile the list into the mmap-able artifact the scorer loads
+from vocab_artifact import build_artifact
+build_artifact(['keywords.txt'], 'keywords.vocab')
@@ -0,0 +1,378 @@
+"""
+Streaming job-description extraction from posting HTML.
+
+The original extractor built a full BeautifulSoup tree, ran a CSS select
+for the description container and called get_text on it (or on the whole
+page when nothing matched). extract_job_description() gives the same text
+from a single streaming pass: parser events go straight to a collector
+that ignores script/style/template subtrees, starts a fresh text run when
+the first container opens and stops parsing as soon as that container
+closes. Pages without a container fall back to the text of the whole page,
+exactly like before; so do pages whose containers are all empty, where
+the old extractor returned nothing.
+
+Events come from the standard library's html.parser by default, which
+tokenizes exactly like the old BeautifulSoup('html.parser') setup did, so
+the text is identical. The "lxml" backend feeds the same collector from
+libxml2 and is faster again, but libxml2 repairs malformed markup (and
+keeps undefined entities and CDATA) differently, so its text can differ on
+broken pages. extract_with_bs4() keeps the old implementation as the
+reference for bench_extract.py.
+"""
+import re
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+
+# Same containers as the old soup.select(), checked in document order
+CONTAINER_SELECTOR = ".job-description, .description, [data-automation='jobDescription']"
+
+# Text BeautifulSoup's get_text leaves out
+SKIP_TAGS = {"script", "style", "template", "rt", "rp"}
+# Elements html.parser never sends an end tag for
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link",
+    "menuitem", "meta", "param", "source", "track", "wbr", "basefont", "bgsound",
+    "command", "frame", "image", "isindex", "nextid", "spacer",
+}
+
+FEED_CHUNK = 16 * 1024
+
+_SKIP_TEXT = 1   # SKIP_TAGS element: its text is left out
+_SKIP_PAGE = 2   # Extractor.skip subtree: left out of the whole-page fallback only
+
+
+class _StopParsing(Exception):
+    pass
+
+
+_COMPOUND_RE = re.compile(r"^([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+|\[[^\]]+\])*)$")
+_PART_RE = re.compile(r"([.#])([\w-]+)|\[\s*([\w-]+)\s*(?:(=)\s*(?:'([^']*)'|\"([^\"]*)\"|([^\s\]]*))\s*)?\]")
+
+
+class Selector:
+    """
+    A comma-separated group of compound CSS selectors, compiled once.
+
+    Supports what posting pages need: tag names, .class, #id, [attr] and
+    [attr=value], combined (div.description[itemprop=description]) and
+    grouped with commas. Combinators are not supported.
+    """
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.compounds = []
+        for part in selector.split(","):
+            part = part.strip()
+            match = _COMPOUND_RE.match(part)
+            if not part or not match:
+                raise ValueError(f"Unsupported selector: {part!r}")
+            tag = match.group(1) if match.group(1) != "*" else None
+            classes, attrs = set(), []
+            for kind, name, attr, equals, single, double, bare in _PART_RE.findall(match.group(2)):
+                if kind == ".":
+                    classes.add(name)
+                elif kind == "#":
+                    attrs.append(("id", name))
+                else:
+                    value = single or double or bare
+                    attrs.append((attr.lower(), value if equals else None))
+            self.compounds.append((tag and tag.lower(), frozenset(classes), tuple(attrs)))
+
+    def matches(self, tag, attrs):
+        for want_tag, classes, want_attrs in self.compounds:
+            if want_tag and want_tag != tag:
+                continue
+            if classes:
+                have = attrs.get("class")
+                if not have or not classes.issubset(have.split()):
+                    continue
+            if all((attrs.get(name) is not None) if value is None else attrs.get(name) == value
+                   for name, value in want_attrs):
+                return True
+        return False
+
+    def __repr__(self):
+        return f"Selector({self.selector!r})"
+
+
+class Extractor:
+    """
+    How to pull the description out of one kind of posting page.
+
+    Args:
+        name: Label for logs and benchmarks
+        containers: Selectors for the description container, best first.
+            The first element matching the best selector that matches at
+            all is used; if none match, the whole page text is.
+        skip: Selector for page chrome (nav, footers, share widgets...) left
+            out of the whole-page fallback. A matched container keeps all
+            of its text, and containers inside skipped subtrees still match.
+        drop_lines: Regexes; output lines matching any of them are removed
+    """
+
+    def __init__(self, name, containers=(CONTAINER_SELECTOR,), skip=None, drop_lines=()):
+        self.name = name
+        self.containers = [Selector(s) for s in containers]
+        self.skip = Selector(skip) if skip else None
+        self.drop_lines = [re.compile(p) for p in drop_lines]
+
+    def clean(self, text):
+        if not self.drop_lines:
+            return text
+        return "\n".join(line for line in text.split("\n")
+                         if not any(p.search(line) for p in self.drop_lines))
+
+    def __repr__(self):
+        return f"Extractor({self.name!r})"
+
+
+DEFAULT_EXTRACTOR = Extractor("generic")
+
+
+class _TextCollector:
+    """
+    Turns parser events into get_text(separator="\\n", strip=True) output.
+
+    Tracks the open elements the way BeautifulSoup does (an end tag closes
+    the most recent open element with that name; unmatched end tags are
+    ignored) so it knows when a container ends. Text goes to the page and
+    to every open container capture at once, so lower-priority containers
+    are there to fall back on without a second pass; parsing stops as soon
+    as the top-priority container closes. Extractor.skip subtrees are left
+    out of the page text only, never out of a container.
+    """
+
+    def __init__(self, extractor=DEFAULT_EXTRACTOR):
+        self.containers = extractor.containers
+        self.skip = extractor.skip
+        self.stack = []        # (tag name, skip kind) of open elements
+        self.skip_depth = 0    # open elements whose text is left out
+        self.page_skip_depth = 0  # open extractor.skip subtrees, left out of the page text
+        self.captures = [None] * len(self.containers)  # per selector: text parts
+        self.open_captures = []  # (stack depth, parts, selector index)
+        self.page_parts = []
+        self.run = []
+        self.done = False
+
+    def _flush(self):
+        if self.run:
+            text = "".join(self.run).strip()
+            self.run = []
+            if text:
+                if not self.page_skip_depth:
+                    self.page_parts.append(text)
+                for _, parts, _ in self.open_captures:
+                    parts.append(text)
+
+    def _match_containers(self, tag, attrs, depth):
+        for index, selector in enumerate(self.containers):
+            if self.captures[index] is None and selector.matches(tag, attrs):
+                parts = self.captures[index] = []
+                # A void element is an empty, already closed container
+                if depth is not None:
+                    self.open_captures.append((depth, parts, index))
+
+    def start(self, tag, attrs):
+        if self.done:
+            return
+        self._flush()
+        if tag in VOID_TAGS:
+            self._match_containers(tag, attrs, None)
+            return
+        if tag in SKIP_TAGS:
+            kind = _SKIP_TEXT
+        elif self.skip is not None and self.skip.matches(tag, attrs):
+            kind = _SKIP_PAGE
+            self.page_skip_depth += 1
+        else:
+            kind = None
+        self.stack.append((tag, kind))
+        if kind == _SKIP_TEXT:
+            self.skip_depth += 1
+        self._match_containers(tag, attrs, len(self.stack))
+
+    def end(self, tag):
+        if self.done:
+            return
+        # Even an unmatched end tag ends the current string
+        self._flush()
+        if not any(name == tag for name, _ in self.stack):
+            return
+        while self.stack:
+            name, kind = self.stack.pop()
+            if kind == _SKIP_TEXT:
+                self.skip_depth -= 1
+            elif kind == _SKIP_PAGE:
+                self.page_skip_depth -= 1
+            if name == tag:
+                break
+        depth = len(self.stack)
+        if self.open_captures and self.open_captures[-1][0] > depth:
+            still_open = []
+            for capture in self.open_captures:
+                if capture[0] <= depth:
+                    still_open.append(capture)
+                elif capture[2] == 0 and capture[1]:
+                    self.done = True
+            self.open_captures = still_open
+
+    def data(self, text):
+        if not self.skip_depth and not self.done:
+            self.run.append(text)
+
+    def boundary(self):
+        """A comment or declaration: ends the current string without adding text"""
+        if not self.done:
+            self._flush()
+
+    def text(self):
+        self._flush()
+        # An empty container (a placeholder filled in by script) falls through
+        for parts in self.captures:
+            if parts:
+                return "\n".join(parts)
+        return "\n".join(self.page_parts)
+
+
+class _LxmlTarget:
+    """Adapts lxml parser-target callbacks to a _TextCollector"""
+
+    def __init__(self, collector):
+        self.collector = collector
+
+    def start(self, tag, attrib, nsmap=None):
+        self.collector.start(tag, attrib)
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, data):
+        self.collector.data(data)
+
+    def comment(self, text):
+        self.collector.boundary()
+
+    def pi(self, target, data=None):
+        self.collector.boundary()
+
+    def close(self):
+        return None
+
+
+class _StreamingHTMLParser(HTMLParser):
+    """html.parser front end for a _TextCollector"""
+
+    def __init__(self, collector):
+        # Entities are resolved below, the way BeautifulSoup resolves them
+        super().__init__(convert_charrefs=False)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {name: value or "" for name, value in attrs})
+        if self.collector.done:
+            raise _StopParsing
+
+    def handle_startendtag(self, tag, attrs):
+        # <tag/> opens and closes at once, whatever the tag
+        self.collector.start(tag, {name: value or "" for name, value in attrs})
+        if tag not in VOID_TAGS:
+            self.collector.end(tag)
+        if self.collector.done:
+            raise _StopParsing
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+        if self.collector.done:
+            raise _StopParsing
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_entityref(self, name):
+        # Unknown entities stay as literal text, minus the semicolon
+        self.collector.data(html5.get(name + ";", "&" + name))
+
+    def handle_charref(self, name):
+        self.collector.data(unescape(f"&#{name};"))
+
+    def unknown_decl(self, data):
+        self.collector.boundary()
+        if data.startswith("CDATA["):
+            self.collector.data(data[len("CDATA["):])
+            self.collector.boundary()
+
+    def handle_comment(self, data):
+        self.collector.boundary()
+
+    def handle_decl(self, decl):
+        self.collector.boundary()
+
+    def handle_pi(self, data):
+        self.collector.boundary()
+
+
+def _extract_lxml(html, extractor):
+    collector = _TextCollector(extractor)
+    parser = etree.HTMLParser(target=_LxmlTarget(collector), recover=True,
+                              remove_comments=False, no_network=True)
+    for offset in range(0, len(html), FEED_CHUNK):
+        parser.feed(html[offset:offset + FEED_CHUNK])
+        if collector.done:
+            break
+    else:
+        parser.close()
+    return collector.text()
+
+
+def _extract_stdlib(html, extractor):
+    collector = _TextCollector(extractor)
+    parser = _StreamingHTMLParser(collector)
+    try:
+        for offset in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[offset:offset + FEED_CHUNK])
+        parser.close()
+    except _StopParsing:
+        pass
+    return collector.text()
+
+
+DEFAULT_BACKEND = "stdlib"
+BACKENDS = {"stdlib": _extract_stdlib}
+if etree is not None:
+    BACKENDS["lxml"] = _extract_lxml
+
+
+def extract_job_description(html, backend=None, extractor=None):
+    """
+    Pull the job description text out of a posting page.
+
+    Args:
+        html: The page HTML
+        backend: "stdlib" (default, same text as BeautifulSoup) or "lxml"
+        extractor: Extractor to use; DEFAULT_EXTRACTOR (the old generic
+            selector) when None. See site_extractors.extract_for_url for
+            picking one by host.
+
+    Returns:
+        The description text, or the whole page text if no known container
+        matched or every matched one was empty
+    """
+    extractor = extractor or DEFAULT_EXTRACTOR
+    return extractor.clean(BACKENDS[backend or DEFAULT_BACKEND](html, extractor))
+
+
+def extract_with_bs4(html):
+    """The original BeautifulSoup extraction, kept as the parity reference"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    job_desc_containers = soup.select(CONTAINER_SELECTOR)
+    if job_desc_containers:
+        return job_desc_containers[0].get_text(separator="\n", strip=True)
+    return soup.get_text(separator="\n", strip=True)
@@ -0,0 +1,211 @@
+"""
+Live re-scoring of a resume while it is being edited.
+
+IncrementalScorer holds one job description and the last scored resume,
+split into markdown sections (cut at headings and blank lines). Each
+section remembers its term counts and skill hits. When the resume changes,
+only sections whose markdown changed are converted to text, tokenized and
+scanned again, and their contributions are swapped in and out of running
+totals. The skill match and the two-document TF-IDF cosine (see
+tfidf_cache.pair_cosine) are then read straight off those totals.
+"""
+import hashlib
+import math
+import re
+import time
+from collections import Counter
+
+from fast_scoring import prepare_job_description
+from md_text import markdown_to_text
+from tfidf_cache import IDF_SHARED, IDF_SINGLE, term_counts
+
+_HEADING_RE = re.compile(r"#{1,6}(\s|$)")
+_FENCE_RE = re.compile(r"(```|~~~)")
+
+
+def split_markdown_sections(markdown_content):
+    """
+    Split markdown into chunks at headings and blank lines.
+
+    Each heading-delimited section is further cut at its blank lines so an
+    edit to one bullet only re-scores its paragraph. Nothing inside a fenced
+    code block or an HTML comment starts a chunk.
+
+    Args:
+        markdown_content: The markdown text
+
+    Returns:
+        List of section strings; joined they give back the input
+    """
+    sections = []
+    current = []
+    in_fence = False
+    in_comment = False
+    after_blank = False
+    for line in markdown_content.splitlines(keepends=True):
+        stripped = line.lstrip()
+        boundary = _HEADING_RE.match(stripped) or (after_blank and stripped)
+        if not in_fence and not in_comment and boundary and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+        after_blank = not stripped
+        if _FENCE_RE.match(stripped):
+            in_fence = not in_fence
+        if not in_fence:
+            opened = line.rfind("<!--")
+            closed = line.rfind("-->")
+            if opened > closed:
+                in_comment = True
+            elif closed != -1:
+                in_comment = False
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+class _SectionState:
+    __slots__ = ("text", "counts", "skills")
+
+    def __init__(self, markdown_section, matcher):
+        self.text = markdown_to_text(markdown_section)
+        self.counts = term_counts(self.text)
+        self.skills = matcher.find_ids(self.text)
+
+
+class IncrementalScorer:
+    """
+    Keeps a resume scored against one job description as it changes.
+
+    Args:
+        job_desc: The job description text
+        skill_matcher: Matcher to use (defaults to the ATS built-ins)
+        jd_handle: A fast_scoring.JobDescriptionHandle to reuse instead of
+            preparing job_desc again (job_desc and skill_matcher are then
+            ignored)
+    """
+
+    def __init__(self, job_desc, skill_matcher=None, jd_handle=None):
+        self.jd = jd_handle or prepare_job_description(job_desc, skill_matcher)
+        self.matcher = self.jd.matcher
+        self.job_desc = self.jd.job_desc
+        self.jd_terms = self.jd.terms
+        self.required = self.jd.required
+        self.required_set = self.jd.required_set
+        self._reset_resume()
+
+    def _reset_resume(self):
+        self.sections = []  # list of (section hash, _SectionState)
+        self.counts = Counter()
+        self.skill_hits = Counter()  # skill id -> number of sections containing it
+        self.matched = 0
+        # Running sums behind the cosine, kept as integers so they never drift
+        self.dot = 0
+        self.shared_sq = 0       # resume counts^2 over terms the job description has
+        self.single_sq = 0       # resume counts^2 over terms it doesn't
+        self.shared_jd_sq = 0    # job counts^2 over terms the resume has
+
+    def _apply_term(self, term, old, new):
+        jd_count = self.jd_terms.counts.get(term)
+        if jd_count:
+            self.dot += (new - old) * jd_count
+            self.shared_sq += new * new - old * old
+            if not old and new:
+                self.shared_jd_sq += jd_count * jd_count
+            elif old and not new:
+                self.shared_jd_sq -= jd_count * jd_count
+        else:
+            self.single_sq += new * new - old * old
+
+    def _apply_section(self, state, sign, term_deltas):
+        for term, count in state.counts.items():
+            term_deltas[term] += sign * count
+        for skill in state.skills:
+            before = self.skill_hits[skill]
+            self.skill_hits[skill] = before + sign
+            if skill in self.required_set:
+                if before == 0 and sign > 0:
+                    self.matched += 1
+                elif before == 1 and sign < 0:
+                    self.matched -= 1
+            if not self.skill_hits[skill]:
+                del self.skill_hits[skill]
+
+    def update(self, markdown_content):
+        """
+        Re-score after an edit, touching only the sections that changed.
+
+        Args:
+            markdown_content: The full, current resume markdown
+
+        Returns:
+            Dict with the keys of ATS.calculate_detailed_score plus
+            'sections_rescored' and 'elapsed' (seconds)
+        """
+        start = time.perf_counter()
+        previous = {}
+        for key, state in self.sections:
+            previous.setdefault(key, []).append(state)
+
+        term_deltas = Counter()
+        new_sections = []
+        rescored = 0
+        for chunk in split_markdown_sections(markdown_content):
+            key = hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest()
+            reusable = previous.get(key)
+            if reusable:
+                state = reusable.pop()
+            else:
+                state = _SectionState(chunk, self.matcher)
+                self._apply_section(state, 1, term_deltas)
+                rescored += 1
+            new_sections.append((key, state))
+
+        # Whatever wasn't reused has been edited away
+        for states in previous.values():
+            for state in states:
+                self._apply_section(state, -1, term_deltas)
+
+        for term, delta in term_deltas.items():
+            if delta:
+                old = self.counts[term]
+                new = old + delta
+                self._apply_term(term, old, new)
+                if new:
+                    self.counts[term] = new
+                else:
+                    del self.counts[term]
+
+        self.sections = new_sections
+        result = self.result()
+        result['sections_rescored'] = rescored
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    def similarity(self):
+        resume_sq = IDF_SHARED ** 2 * self.shared_sq + IDF_SINGLE ** 2 * self.single_sq
+        jd_sq = IDF_SINGLE ** 2 * self.jd_terms.sq_sum - (IDF_SINGLE ** 2 - IDF_SHARED ** 2) * self.shared_jd_sq
+        if not self.dot or not resume_sq or not jd_sq:
+            return 0.0
+        return self.dot / math.sqrt(resume_sq * jd_sq)
+
+    def resume_text(self):
+        """Text of the last scored resume, as the sections were scored"""
+        return "\n".join(state.text for _, state in self.sections if state.text)
+
+    def result(self):
+        """Score of the last resume passed to update()"""
+        total = len(self.required)
+        skill_match = self.matched / total if total else 0
+        cosine_sim = self.similarity()
+        matched_skills = [self.matcher.term(t) for t in self.required if t in self.skill_hits]
+        missing_skills = [self.matcher.term(t) for t in self.required if t not in self.skill_hits]
+        return {
+            'overall_score': float(0.7 * skill_match + 0.3 * cosine_sim),
+            'skill_match_score': skill_match,
+            'document_similarity': float(cosine_sim),
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+            'total_skills_required': total,
+            'skills_matched': len(matched_skills)
+        }
@@ -0,0 +1,161 @@
+"""
+Plain text of a markdown resume, straight from the parsed document.
+
+Scoring used to render the resume to PDF and run pdftotext on it just to get
+its words back. markdown_to_text() walks the element tree the markdown
+package builds instead, keeping what ends up visible on the page (headings,
+paragraphs, list items, table cells, link text) and dropping what doesn't
+(images, HTML comments). No renderer, subprocess or temp file is involved.
+
+The resumes are written for pandoc, so markdown_extensions() sets
+python-markdown up to read them the same way: a pipe table ends at the
+first line without a pipe (python-markdown would pull the bullets under a
+table heading into the table as rows), and dashes, quotes and ellipses are
+made typographic like pandoc's smart extension. markdown_to_text() and
+pdf_generator's in-process renderer both use it, so the text scored is the
+text pandoc puts on the page.
+"""
+import html
+import re
+import threading
+
+import markdown
+from markdown.extensions import Extension
+from markdown.preprocessors import Preprocessor
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import AMP_SUBSTITUTE
+
+# Elements that start on a new line in the rendered document
+BLOCK_TAGS = {
+    "p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "ul", "ol", "tr", "table",
+    "thead", "tbody", "blockquote", "pre", "div", "hr", "dl", "dt", "dd", "br",
+}
+# Elements whose content never shows up as text
+SKIP_TAGS = {"img", "script", "style"}
+# Table cells sit side by side on one line
+CELL_TAGS = {"td", "th"}
+
+_STASH_RE = re.compile("\x02wzxhzdk:(\\d+)\x03")
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+_TABLE_DELIMITER_RE = re.compile(r"\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+# Names the dialect for render caches; change it when the extensions change
+MARKDOWN_DIALECT = "extra+sane_lists+smarty+pandoc_tables"
+
+
+class _PandocTables(Preprocessor):
+    """Ends each pipe table at its first line without a pipe, as pandoc does"""
+
+    def run(self, lines):
+        out = []
+        in_table = in_comment = False
+        for line in lines:
+            if in_comment:
+                in_comment = "-->" not in line
+            elif in_table and line.strip() and "|" not in line:
+                # A blank line makes python-markdown close the table here too
+                out.append("")
+                in_table = False
+            elif not line.strip():
+                in_table = False
+            elif "|" in (out[-1] if out else "") and _TABLE_DELIMITER_RE.match(line):
+                in_table = True
+            if not in_comment and "<!--" in line and "-->" not in line.split("<!--")[-1]:
+                in_comment = True
+                in_table = False
+            out.append(line)
+        return out
+
+
+class _DropEmptyTableRows(Treeprocessor):
+    """Removes the blank body row python-markdown gives header-only tables"""
+
+    def run(self, root):
+        for tbody in root.iter("tbody"):
+            for row in list(tbody):
+                if all(not (cell.text or "").strip() and not len(cell) for cell in row):
+                    tbody.remove(row)
+
+
+class _PandocTablesExtension(Extension):
+    def extendMarkdown(self, md):
+        # After fenced code is stashed (25), before raw HTML blocks are (20)
+        md.preprocessors.register(_PandocTables(md), "pandoc_tables", 24)
+        md.treeprocessors.register(_DropEmptyTableRows(md), "drop_empty_table_rows", 0)
+
+
+def markdown_extensions():
+    """Extensions that make python-markdown read a resume the way pandoc does"""
+    return ["extra", "sane_lists", "smarty", _PandocTablesExtension()]
+
+
+class _CaptureTree(Treeprocessor):
+    """Hands the finished element tree back to the Markdown instance"""
+
+    def run(self, root):
+        self.md.text_root = root
+
+
+class _CaptureTreeExtension(Extension):
+    def extendMarkdown(self, md):
+        # Lowest priority: runs after inline parsing and unescaping
+        md.treeprocessors.register(_CaptureTree(md), "capture_tree", -100)
+
+
+_local = threading.local()
+
+
+def _get_markdown():
+    md = getattr(_local, "md", None)
+    if md is None:
+        md = _local.md = markdown.Markdown(extensions=markdown_extensions() + [_CaptureTreeExtension()])
+    md.reset()
+    return md
+
+
+def _walk(element, parts):
+    tag = element.tag if isinstance(element.tag, str) else ""
+    if tag in SKIP_TAGS:
+        if element.tail:
+            parts.append(element.tail)
+        return
+    if tag in BLOCK_TAGS:
+        parts.append("\n")
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        _walk(child, parts)
+    if tag in BLOCK_TAGS:
+        parts.append("\n")
+    elif tag in CELL_TAGS:
+        parts.append(" ")
+    if element.tail:
+        parts.append(element.tail)
+
+
+def markdown_to_text(markdown_content):
+    """
+    Extract the visible text of a markdown document.
+
+    Args:
+        markdown_content: The markdown text
+
+    Returns:
+        Text with one line per block element, similar to pdftotext output
+    """
+    md = _get_markdown()
+    md.convert(markdown_content)
+    parts = []
+    _walk(md.text_root, parts)
+    text = "".join(parts).replace(AMP_SUBSTITUTE, "&")
+
+    # Raw HTML was stashed during parsing; keep its visible text only
+    def unstash(match):
+        raw = md.htmlStash.rawHtmlBlocks[int(match.group(1))]
+        raw = _TAG_RE.sub(" ", _COMMENT_RE.sub("", str(raw)))
+        return html.unescape(raw)
+
+    text = _STASH_RE.sub(unstash, text)
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
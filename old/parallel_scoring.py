@@ -0,0 +1,125 @@
+"""
+Multi-process scoring engine for large batches of (resume, job description) pairs.
+
+Pairs are cut into chunks and farmed out to a ProcessPoolExecutor. Each
+worker maps the compiled vocabulary artifact once in its initializer (the
+pages are shared with every other worker through the OS page cache), and
+pairs in a chunk that share a resume are scored together with
+batch_scoring.score_many, so that resume is scanned and tokenized once per
+chunk instead of once per pair. Results are yielded as chunks finish, and
+only a bounded number of chunks are in flight at a time, so memory stays
+flat however long the input feed is.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from batch_scoring import score_many
+from simple_ats import DEFAULT_SKILL_MATCHER
+from vocab_artifact import open_vocabulary
+
+# Per-worker matcher, set up by _init_worker
+_matcher = None
+
+
+def _init_worker(vocab_path):
+    global _matcher
+    _matcher = open_vocabulary(vocab_path).matcher() if vocab_path else DEFAULT_SKILL_MATCHER
+
+
+def _score_chunk(chunk):
+    by_resume = {}
+    for key, resume, job_desc in chunk:
+        by_resume.setdefault(resume, []).append((key, job_desc))
+
+    results = []
+    for resume, items in by_resume.items():
+        scores = score_many(resume, [job_desc for _, job_desc in items], skill_matcher=_matcher)
+        results.extend(zip((key for key, _ in items), scores))
+    return results
+
+
+def _chunks(pairs, chunk_size):
+    it = iter(pairs)
+    index = 0
+    while True:
+        chunk = []
+        for pair in islice(it, chunk_size):
+            if len(pair) == 2:
+                pair = (index, pair[0], pair[1])
+            chunk.append(pair)
+            index += 1
+        if not chunk:
+            return
+        yield chunk
+
+
+class ScoringEngine:
+    """
+    Score (resume, job description) pairs across a pool of worker processes.
+
+    Args:
+        vocab_path: Compiled vocabulary artifact (see vocab_artifact.py); the
+            ATS built-in skill lists are used when None
+        max_workers: Worker process count, defaults to the CPU count
+        chunk_size: Pairs sent to a worker per task
+        max_in_flight: Chunks submitted but not yet collected, defaults to
+            twice the worker count
+    """
+
+    def __init__(self, vocab_path=None, max_workers=None, chunk_size=64, max_in_flight=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(vocab_path,),
+        )
+
+    def score_pairs(self, pairs):
+        """
+        Score pairs, yielding results as they complete.
+
+        Args:
+            pairs: Iterable of (resume, job_desc) or (key, resume, job_desc)
+                tuples; it is consumed lazily. Without a key the pair's
+                position in the input is used.
+
+        Yields:
+            (key, result) tuples in completion order, where result is the
+            dict ATS.calculate_detailed_score returns
+        """
+        chunks = _chunks(pairs, self.chunk_size)
+        in_flight = set()
+        try:
+            for chunk in chunks:
+                in_flight.add(self._pool.submit(_score_chunk, chunk))
+                if len(in_flight) >= self.max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            # Abandoned generator: don't leave queued chunks running
+            for future in in_flight:
+                future.cancel()
+
+    def score_resume_against(self, resume, job_descs):
+        """Score one resume against many job descriptions, returning results in input order"""
+        results = [None] * len(job_descs)
+        for index, result in self.score_pairs((resume, jd) for jd in job_descs):
+            results[index] = result
+        return results
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
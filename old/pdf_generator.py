@@ -1,13 +1,134 @@
 import os
+import shutil
+import hashlib
 import subprocess
+import threading
+from functools import lru_cache
 
-def generate_pdf_from_markdown(markdown_content, temp_dir):
+# In-process rendering needs markdown + weasyprint (and its pango libraries)
+try:
+    import markdown
+    import weasyprint
+    from md_text import MARKDOWN_DIALECT, markdown_extensions
+    from weasyprint import HTML, CSS
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        from weasyprint.fonts import FontConfiguration
+except (ImportError, OSError):
+    weasyprint = None
+
+# Rendered PDFs keyed by hash of markdown + style.css + engine versions
+RENDER_CACHE_DIR = ".render_cache"
+RENDER_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+@lru_cache(maxsize=None)
+def get_engine_version(backend="pandoc"):
+    """Version banner of the render engine, so upgrades invalidate cached renders"""
+    if backend == "weasyprint":
+        return f"weasyprint {weasyprint.__version__} markdown {markdown.__version__} {MARKDOWN_DIALECT}"
+    versions = []
+    for cmd in (["pandoc", "--version"], ["weasyprint", "--version"]):
+        try:
+            output = subprocess.run(cmd, capture_output=True, text=True).stdout
+            versions.append(output.splitlines()[0] if output else "unknown")
+        except OSError:
+            versions.append("missing")
+    return " | ".join(versions)
+
+def render_cache_key(markdown_content, css_path="style.css", backend="pandoc"):
+    """Content hash identifying one render of markdown_content with css_path"""
+    digest = hashlib.sha256()
+    digest.update(markdown_content.encode("utf-8"))
+    digest.update(b"\0")
+    if os.path.exists(css_path):
+        with open(css_path, "rb") as f:
+            digest.update(f.read())
+    digest.update(b"\0")
+    digest.update(get_engine_version(backend).encode("utf-8"))
+    return digest.hexdigest()
+
+class WeasyPrintRenderer:
+    """
+    Renders markdown to PDF inside this process.
+
+    Markdown is converted to HTML with the markdown package, set up to read
+    it like pandoc (see md_text.markdown_extensions), and laid out by
+    WeasyPrint directly, skipping the pandoc process and the WeasyPrint
+    process pandoc would start. The parsed style.css and the font
+    configuration are kept between renders; the stylesheet is re-parsed
+    only when the file changes.
+    """
+
+    def __init__(self, css_path="style.css"):
+        self.css_path = css_path
+        self.font_config = FontConfiguration()
+        self._css = None
+        self._css_mtime = None
+
+    def stylesheet(self):
+        mtime = os.path.getmtime(self.css_path)
+        if self._css is None or mtime != self._css_mtime:
+            self._css = CSS(filename=self.css_path, font_config=self.font_config)
+            self._css_mtime = mtime
+        return self._css
+
+    def render(self, markdown_content, pdf_path):
+        body = markdown.markdown(markdown_content, extensions=markdown_extensions())
+        html = f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"></head><body>\n{body}\n</body></html>'
+        HTML(string=html, base_url=os.getcwd()).write_pdf(
+            pdf_path, stylesheets=[self.stylesheet()], font_config=self.font_config
+        )
+
+@lru_cache(maxsize=None)
+def get_weasyprint_renderer(css_path="style.css"):
+    """Process-wide renderer, so CSS and fonts stay loaded between renders"""
+    return WeasyPrintRenderer(css_path)
+
+def resolve_backend(backend="auto"):
+    """
+    Pick pandoc when it is installed, otherwise in-process weasyprint.
+
+    Pandoc stays the default so existing PDFs don't change under anyone;
+    ask for "weasyprint" to skip the subprocesses.
+    """
+    if backend == "auto":
+        return "pandoc" if shutil.which("pandoc") or weasyprint is None else "weasyprint"
+    return backend
+
+def render_with_pandoc(md_path, pdf_path, css_path="style.css"):
+    cmd = ["pandoc", md_path, "-o", pdf_path, "--pdf-engine=weasyprint", "--css", css_path]
+    subprocess.run(cmd, check=True)
+
+def evict_render_cache(cache_dir=RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_MAX_BYTES):
+    """Delete least recently used renders until the cache fits in max_bytes"""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith(".pdf") and os.path.isfile(path):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def generate_pdf_from_markdown(markdown_content, temp_dir, use_cache=True, backend="auto"):
     """
     Generate a PDF file from markdown content.
     
     Args:
         markdown_content: The markdown text
         temp_dir: Directory to store temporary files
+        use_cache: Reuse an earlier render of the same markdown, CSS and engine
+        backend: "weasyprint" (in-process), "pandoc" (subprocess) or "auto"
         
     Returns:
         Path to the generated PDF or None if failed
@@ -25,13 +146,53 @@ def generate_pdf_from_markdown(markdown_content, temp_dir):
         if not os.path.exists("style.css"):
             create_default_style_css()
         
-        # Generate PDF using Pandoc
         pdf_path = os.path.join(temp_dir, "resume.pdf")
-        cmd = ["pandoc", md_path, "-o", pdf_path, "--pdf-engine=weasyprint", "--css", "style.css"]
+        # The preview may be reading pdf_path right now: write next to it and
+        # rename over it, so a reader sees the old PDF or the new one, never
+        # half of one. The name still ends in .pdf for pandoc's sake
+        render_path = os.path.join(temp_dir, f"resume.{os.getpid()}.{threading.get_ident()}.tmp.pdf")
+        backend = resolve_backend(backend)
+        
+        # Serve unchanged resumes straight from the render cache
+        if use_cache:
+            cache_key = render_cache_key(markdown_content, backend=backend)
+            cached_path = os.path.join(RENDER_CACHE_DIR, cache_key + ".pdf")
+            if os.path.exists(cached_path):
+                os.utime(cached_path)  # mark as recently used
+                shutil.copyfile(cached_path, render_path)
+                os.replace(render_path, pdf_path)
+                return pdf_path
+        
+        try:
+            if backend == "weasyprint":
+                try:
+                    get_weasyprint_renderer().render(markdown_content, render_path)
+                except Exception as e:
+                    # Keep the pandoc path as a fallback
+                    print(f"In-process render failed, falling back to pandoc: {e}")
+                    render_with_pandoc(md_path, render_path)
+                    if use_cache:
+                        cache_key = render_cache_key(markdown_content, backend="pandoc")
+                        cached_path = os.path.join(RENDER_CACHE_DIR, cache_key + ".pdf")
+            else:
+                render_with_pandoc(md_path, render_path)
+            
+            if not os.path.exists(render_path):
+                return None
+            os.replace(render_path, pdf_path)
+        finally:
+            if os.path.exists(render_path):
+                os.remove(render_path)
         
-        subprocess.run(cmd, check=True)
+        if use_cache:
+            # Copy then rename so readers never see a half-written PDF
+            os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+            tmp_path = cached_path + f".{os.getpid()}.tmp"
+            shutil.copyfile(pdf_path, tmp_path)
+            os.replace(tmp_path, cached_path)
+            evict_render_cache()
         
-        return pdf_path if os.path.exists(pdf_path) else None
+        return pdf_path
     
     except Exception as e:
         print(f"Error generating PDF: {e}")
@@ -0,0 +1,168 @@
+"""
+Lazy, cached page rasterization for the PDF preview.
+
+display_pdf used to rasterize every page at 150 dpi on each render and then
+LANCZOS-resize each one to the preview size. PdfDocument reads the page
+count and page size once (pdfinfo) and rasterizes only the pages asked
+for, straight at the target height (pdftoppm's scale-to via pdf2image's
+size=), one pdftoppm call per run of consecutive pages. Pages land in
+PAGE_CACHE, an LRU keyed by (PDF content hash, page, height), so
+scrolling back, re-rendering an unchanged resume or reopening the preview
+costs nothing, and a new zoom level only misses for the pages it shows.
+
+The Tk preview asks for the pages in the viewport and prefetches their
+neighbours in the background, see ResumeATSApp.update_visible_pages.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+PREVIEW_CACHE_BYTES = 64 * 1024 * 1024
+# Pages rasterized ahead of and behind the viewport
+PREFETCH_PAGES = 1
+
+_PAGE_SIZE_RE = re.compile(r"([\d.]+) x ([\d.]+)")
+
+
+def pdf_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageCache:
+    """
+    Thread-safe LRU of rasterized pages with a memory budget.
+
+    Args:
+        max_bytes: Approximate budget for the decoded images
+    """
+
+    def __init__(self, max_bytes=PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._pages = OrderedDict()  # (pdf hash, page, height) -> (image, size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pages)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None:
+                return None
+            self._pages.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, image):
+        size = image.width * image.height * len(image.getbands())
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._pages[key] = (image, size)
+            self.nbytes += size
+            # Always keep the newest page, even if it alone exceeds the budget
+            while self.nbytes > self.max_bytes and len(self._pages) > 1:
+                _, (_, evicted) = self._pages.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self.nbytes = 0
+
+
+PAGE_CACHE = PageCache()
+
+
+class PdfDocument:
+    """
+    A PDF opened for previewing: page count and size, pages on demand.
+
+    Args:
+        path: The PDF
+        cache: PageCache for rasterized pages
+    """
+
+    def __init__(self, path, cache=PAGE_CACHE):
+        self.path = path
+        self.cache = cache
+        self.stat = self._stat()
+        self.hash = pdf_hash(path)
+        info = pdfinfo_from_path(path)
+        self.page_count = int(info["Pages"])
+        match = _PAGE_SIZE_RE.search(info.get("Page size", ""))
+        # Pages are assumed to share the first page's shape, which resumes do
+        width, height = (float(match.group(1)), float(match.group(2))) if match else (612.0, 792.0)
+        self.aspect = width / height
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def replaced(self):
+        """Whether a new render has been renamed over the file since it was opened"""
+        try:
+            return self._stat() != self.stat
+        except OSError:
+            return True
+
+    def page_width(self, height):
+        return round(height * self.aspect)
+
+    def key(self, page, height):
+        return (self.hash, page, height)
+
+    def cached(self, page, height):
+        return self.cache.get(self.key(page, height))
+
+    def render(self, first, last, height, token=None):
+        """
+        Rasterize pages first..last (1-based, inclusive) at height pixels.
+
+        Only pages missing from the cache are rasterized, one pdftoppm run
+        per consecutive stretch of them. If the file has been replaced
+        since it was opened, nothing more is rasterized (its pages would
+        be cached under the old hash); the newer document takes over.
+
+        Args:
+            token: Optional background_jobs.CancelToken, checked between runs
+
+        Returns:
+            Dict of page number -> PIL image
+        """
+        first = max(1, first)
+        last = min(self.page_count, last)
+        pages = {}
+        missing = []
+        for page in range(first, last + 1):
+            image = self.cached(page, height)
+            if image is None:
+                missing.append(page)
+            else:
+                pages[page] = image
+
+        runs = []
+        for page in missing:
+            if runs and runs[-1][1] == page - 1:
+                runs[-1][1] = page
+            else:
+                runs.append([page, page])
+        for start, end in runs:
+            if token is not None:
+                token.check()
+            if self.replaced():
+                break
+            images = convert_from_path(self.path, first_page=start, last_page=end, size=(None, height))
+            for page, image in zip(range(start, end + 1), images):
+                self.cache.put(self.key(page, height), image)
+                pages[page] = image
+        return pages
@@ -0,0 +1,87 @@
+"""
+Per-stage timing and opt-in profiling for the scoring pipeline.
+
+score_resume runs render, extract, section split, skill match and
+similarity as named stages of a StageTimer. Every stage is timed with
+perf_counter and the timings come back with the score. Two opt-in extras
+help find which stage dominates in production:
+
+    add_stage_hook(lambda stage, seconds: metrics.observe(stage, seconds))
+
+calls a function after every stage of every score, and profiling (profile=True,
+or RESUME_ATS_PROFILE=1 in the environment) runs each stage under cProfile
+and returns the hottest functions as text.
+"""
+import cProfile
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+
+PROFILE_ENV = "RESUME_ATS_PROFILE"
+
+_stage_hooks = []
+
+
+def add_stage_hook(hook):
+    """Call hook(stage, seconds) after every timed stage"""
+    _stage_hooks.append(hook)
+
+
+def remove_stage_hook(hook):
+    _stage_hooks.remove(hook)
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+class StageTimer:
+    """
+    Times named stages of one pipeline run.
+
+    Args:
+        profile: Also run the stages under cProfile; None reads
+            RESUME_ATS_PROFILE from the environment
+    """
+
+    def __init__(self, profile=None):
+        if profile is None:
+            profile = profiling_enabled()
+        self.timings = {}
+        self.profiler = cProfile.Profile() if profile else None
+
+    @contextmanager
+    def stage(self, name):
+        if self.profiler is not None:
+            self.profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.profiler is not None:
+                self.profiler.disable()
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            for hook in list(_stage_hooks):
+                hook(name, elapsed)
+
+    def slowest(self):
+        """(stage, seconds) of the slowest stage, or None"""
+        if not self.timings:
+            return None
+        return max(self.timings.items(), key=lambda item: item[1])
+
+    def profile_stats(self, limit=20, sort="cumulative"):
+        """The top functions from cProfile as text, or None when not profiling"""
+        if self.profiler is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+def format_timings(timings):
+    """Timings as "stage 12ms, stage 3ms" for logs"""
+    return ", ".join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in timings.items())
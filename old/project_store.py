@@ -0,0 +1,440 @@
+"""
+SQLite-backed project store.
+
+Projects used to be one directory each under projects/, with the resume,
+job description, URL, logs, scores and metadata in separate files. Listing
+them meant a directory scan plus a project_meta.json read per project, and
+loading one opened up to six files. Here every project is a row in
+projects/projects.db: metadata in `projects` (indexed by company, dates and
+score, so the picker is one index scan) and each text artifact in its own
+`project_artifacts` row, so loading a project is one keyed join.
+
+Saves only write what changed. Each artifact row carries a hash of its
+text, and save() compares against those and the stored metadata inside one
+transaction, so saving a project after editing the resume rewrites the
+resume row and nothing else, and a save with no changes writes nothing.
+
+Binary artifacts (rendered PDFs, CV.docx and the like) stay on disk in
+projects/<name>/, see project_dir(). save_file() records their hash and
+size and skips the copy when the incoming file is identical; when it does
+copy, it writes a temp file and os.replace()s it into place. The first time
+the database is created, the existing projects/<name>/ directories are
+imported.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+PROJECTS_DIR = "projects"
+PROJECT_DB = os.path.join(PROJECTS_DIR, "projects.db")
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    company_name TEXT NOT NULL,
+    job_url TEXT NOT NULL DEFAULT '',
+    current_score REAL NOT NULL DEFAULT 0,
+    highest_score REAL NOT NULL DEFAULT 0,
+    score_chain TEXT NOT NULL DEFAULT '[0]',
+    date_created TEXT NOT NULL,
+    date_modified TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_company ON projects (company_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS projects_created ON projects (date_created);
+CREATE INDEX IF NOT EXISTS projects_modified ON projects (date_modified);
+CREATE INDEX IF NOT EXISTS projects_score ON projects (highest_score);
+
+CREATE TABLE IF NOT EXISTS project_artifacts (
+    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    content TEXT NOT NULL,
+    hash BLOB NOT NULL,
+    PRIMARY KEY (project_id, kind)
+);
+
+CREATE TABLE IF NOT EXISTS project_files (
+    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (project_id, filename)
+);
+"""
+
+# Text artifacts, stored one row each
+ARTIFACT_KINDS = ("resume", "job_desc", "logs")
+# Metadata columns save() compares, with their defaults
+META_DEFAULTS = {"job_url": "", "current_score": 0, "highest_score": 0, "score_history": [0]}
+
+# Columns the project picker needs; served from the projects table alone
+LIST_COLUMNS = "name, company_name, job_url, current_score, highest_score, date_created, date_modified"
+LIST_ORDERS = {
+    "modified": "date_modified DESC",
+    "created": "date_created DESC",
+    "company": "company_name COLLATE NOCASE",
+    "score": "highest_score DESC",
+}
+
+# Durability: "off" leaves flushing to the OS, "normal" syncs the WAL at
+# checkpoints and fsyncs copied files, "full" also syncs every commit and
+# the directory entry of every replaced file
+FSYNC_POLICIES = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+# Legacy per-project files the importer reads into the database
+_LEGACY_FILES = {"resume.md", "job_description.md", "job_url.txt", "logs.txt",
+                 "score_history.json", "project_meta.json"}
+
+
+def safe_project_name(company_name):
+    """Directory-safe project name, as the directory layout always used"""
+    return company_name.replace(" ", "_").replace("/", "_").replace("\\", "_")
+
+
+def _now():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _text_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_text(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # not supported here (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ProjectStore:
+    """
+    Projects in one SQLite database.
+
+    Args:
+        db_path: Database file
+        projects_dir: Where binary artifacts live (and legacy projects are
+            imported from)
+        fsync: "off", "normal" or "full", see FSYNC_POLICIES
+    """
+
+    def __init__(self, db_path=PROJECT_DB, projects_dir=PROJECTS_DIR, fsync="normal"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.db_path = db_path
+        self.projects_dir = projects_dir
+        self.fsync = fsync
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # sqlite3 connections can't be shared across threads; the apps
+        # fetch and score on worker threads
+        self._local = threading.local()
+        self._setup()
+
+    def connection(self):
+        """This thread's connection to the database"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; transaction() opens transactions explicitly
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute(f"PRAGMA synchronous={FSYNC_POLICIES[self.fsync]}")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction on this thread's connection, yielding the connection"""
+        # IMMEDIATE takes the write lock up front, so the read-compare-write
+        # in save() can't interleave with another process's save
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _setup(self):
+        conn = self.connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        # executescript commits on its own; the statements are idempotent
+        conn.executescript(SCHEMA)
+        # Before the database there were only the projects/<name>/ folders
+        self.import_directory()
+        # Only after the data is in, so an interrupted import is resumed
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def list_projects(self, order="modified"):
+        """
+        Projects for the picker, without their content.
+
+        Args:
+            order: "modified", "created", "company" or "score"
+
+        Returns:
+            List of dicts with the LIST_COLUMNS keys
+        """
+        rows = self.connection().execute(
+            f"SELECT {LIST_COLUMNS} FROM projects ORDER BY {LIST_ORDERS[order]}"
+        )
+        return [dict(row) for row in rows]
+
+    def names(self, order="modified"):
+        return [row[0] for row in self.connection().execute(
+            f"SELECT name FROM projects ORDER BY {LIST_ORDERS[order]}"
+        )]
+
+    def exists(self, name):
+        return self.connection().execute("SELECT 1 FROM projects WHERE name = ?", (name,)).fetchone() is not None
+
+    def load(self, name):
+        """
+        Load a project and its content in one query.
+
+        Returns:
+            Dict with resume, job_desc, job_url, logs, current_score,
+            highest_score, score_history, company_name, date_created and
+            date_modified, or None if there is no such project
+        """
+        rows = self.connection().execute(
+            "SELECT p.*, a.kind, a.content FROM projects p "
+            "LEFT JOIN project_artifacts a ON a.project_id = p.id WHERE p.name = ?",
+            (name,),
+        ).fetchall()
+        if not rows:
+            return None
+        data = dict(rows[0])
+        for key in ("id", "kind", "content"):
+            del data[key]
+        data["score_history"] = json.loads(data.pop("score_chain"))
+        for kind in ARTIFACT_KINDS:
+            data[kind] = ""
+        for row in rows:
+            if row["kind"] is not None:
+                data[row["kind"]] = row["content"]
+        return data
+
+    def save(self, name, company_name, project_data, date_created=None, date_modified=None):
+        """
+        Create or update a project, writing only what changed.
+
+        A new project gets defaults (empty text, zero scores) for keys
+        missing from project_data. An existing one only has the keys
+        project_data contains written, so a caller that saves the resume
+        and scores leaves the stored logs and job_url alone.
+        date_created is kept from the existing row unless given, and
+        date_modified only moves when something actually changed.
+
+        Returns:
+            List of the fields that were written (empty if nothing changed)
+        """
+        now = _now()
+
+        with self.transaction() as conn:
+            row = conn.execute("SELECT * FROM projects WHERE name = ?", (name,)).fetchone()
+            values = {key: project_data.get(key, default) for key, default in META_DEFAULTS.items()
+                      if row is None or key in project_data}
+            meta = {"company_name": company_name}
+            meta.update((key, value) for key, value in values.items() if key != "score_history")
+            if "score_history" in values:
+                meta["score_chain"] = json.dumps(values["score_history"])
+            artifacts = {kind: project_data.get(kind, "") for kind in ARTIFACT_KINDS
+                         if row is None or kind in project_data}
+            if row is None:
+                project_id = conn.execute(
+                    "INSERT INTO projects (name, company_name, job_url, current_score, highest_score,"
+                    " score_chain, date_created, date_modified) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, meta["company_name"], meta["job_url"], meta["current_score"],
+                     meta["highest_score"], meta["score_chain"], date_created or now, date_modified or now),
+                ).lastrowid
+                stored_hashes = {}
+                changed = list(meta)
+            else:
+                project_id = row["id"]
+                stored_hashes = dict(conn.execute(
+                    "SELECT kind, hash FROM project_artifacts WHERE project_id = ?", (project_id,)
+                ).fetchall())
+                changed = [key for key, value in meta.items() if row[key] != value]
+                if date_created and row["date_created"] != date_created:
+                    meta["date_created"] = date_created
+                    changed.append("date_created")
+
+            for kind, text in artifacts.items():
+                digest = _text_hash(text)
+                if stored_hashes.get(kind) != digest:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO project_artifacts (project_id, kind, content, hash) VALUES (?, ?, ?, ?)",
+                        (project_id, kind, text, digest),
+                    )
+                    changed.append(kind)
+
+            if row is not None and changed:
+                columns = [key for key in changed if key in meta]
+                assignments = ", ".join(f"{key} = ?" for key in columns + ["date_modified"])
+                conn.execute(
+                    f"UPDATE projects SET {assignments} WHERE id = ?",
+                    [meta[key] for key in columns] + [date_modified or now, project_id],
+                )
+        return changed
+
+    def delete(self, name):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+
+    def project_dir(self, name):
+        """Directory for the project's binary artifacts (created on demand)"""
+        path = os.path.join(self.projects_dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def save_file(self, name, filename, source_path):
+        """
+        Copy a binary artifact into the project's directory if it changed.
+
+        The stored size and SHA-256 are checked first, so an unchanged file
+        is never copied again. A changed one is copied to a temp file in the
+        same directory and renamed over the old copy, so a crash leaves
+        either the old or the new file, never half of one.
+
+        Returns:
+            True if the file was copied, False if it was already up to date
+        """
+        dest = os.path.join(self.project_dir(name), filename)
+        size = os.path.getsize(source_path)
+        conn = self.connection()
+        record = conn.execute(
+            "SELECT f.sha256, f.size FROM project_files f JOIN projects p ON p.id = f.project_id"
+            " WHERE p.name = ? AND f.filename = ?",
+            (name, filename),
+        ).fetchone()
+        if record is not None and record["size"] == size and os.path.exists(dest):
+            sha256 = _file_sha256(source_path)
+            if sha256 == record["sha256"]:
+                return False
+        else:
+            sha256 = _file_sha256(source_path)
+
+        tmp_path = dest + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(source_path, "rb") as src, open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+                if self.fsync != "off":
+                    dst.flush()
+                    os.fsync(dst.fileno())
+            os.replace(tmp_path, dest)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.fsync == "full":
+            _fsync_dir(os.path.dirname(dest))
+        self._record_file(name, filename, sha256, size)
+        return True
+
+    def _record_file(self, name, filename, sha256, size):
+        with self.transaction() as conn:
+            row = conn.execute("SELECT id FROM projects WHERE name = ?", (name,)).fetchone()
+            if row is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO project_files (project_id, filename, sha256, size) VALUES (?, ?, ?, ?)",
+                    (row["id"], filename, sha256, size),
+                )
+
+    def import_directory(self, projects_dir=None, overwrite=False):
+        """
+        Import projects from the projects/<name>/ file layout.
+
+        Text files go into the database; other files (PDFs, .docx) stay
+        where they are and are only recorded, so they're never copied.
+
+        Args:
+            projects_dir: Directory to import from (defaults to projects_dir)
+            overwrite: Replace projects already in the database
+
+        Returns:
+            Number of projects imported
+        """
+        projects_dir = projects_dir or self.projects_dir
+        if not os.path.isdir(projects_dir):
+            return 0
+        imported = 0
+        for name in sorted(os.listdir(projects_dir)):
+            project_path = os.path.join(projects_dir, name)
+            if not os.path.isdir(project_path) or (not overwrite and self.exists(name)):
+                continue
+            meta = _read_json(os.path.join(project_path, "project_meta.json"))
+            scores = _read_json(os.path.join(project_path, "score_history.json"))
+            data = {
+                "resume": _read_text(os.path.join(project_path, "resume.md")) or "",
+                "job_desc": _read_text(os.path.join(project_path, "job_description.md")) or "",
+                "job_url": (_read_text(os.path.join(project_path, "job_url.txt")) or "").strip(),
+                "logs": _read_text(os.path.join(project_path, "logs.txt")) or "",
+                "current_score": scores.get("current_score", 0),
+                "highest_score": scores.get("highest_score", 0),
+                "score_history": scores.get("score_chain", [0]),
+            }
+            mtime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(project_path)))
+            self.save(
+                name,
+                meta.get("company_name", name.replace("_", " ")),
+                data,
+                date_created=meta.get("date_created", mtime),
+                date_modified=meta.get("date_modified", mtime),
+            )
+            if os.path.abspath(projects_dir) == os.path.abspath(self.projects_dir):
+                for filename in sorted(os.listdir(project_path)):
+                    path = os.path.join(project_path, filename)
+                    if filename not in _LEGACY_FILES and os.path.isfile(path):
+                        self._record_file(name, filename, _file_sha256(path), os.path.getsize(path))
+            imported += 1
+        return imported
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_project_store():
+    """Process-wide store on PROJECT_DB, created (and imported) on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProjectStore()
+        return _store
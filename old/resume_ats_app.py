@@ -2,19 +2,23 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import customtkinter as ctk
 import markdown
-import requests
-from bs4 import BeautifulSoup
 import threading
-import subprocess
 import os
 import tempfile
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import io
-import sys
-import json
 import time
-from simple_ats import ATS
-from pdf2image import convert_from_path
+from pdf_generator import generate_pdf_from_markdown
+from ats_processor import score_resume
+from profiling import format_timings
+from background_jobs import JobRunner
+from incremental_scorer import IncrementalScorer
+from resume_optimizer import optimize_resume
+from utils import fetch_job_description_from_url
+from project_store import get_project_store, safe_project_name
+from resume_history import get_resume_history
+from score_log import score_log_for
+from pdf_preview import PREFETCH_PAGES, PdfDocument
 
 # Set appearance mode and theme - Catppuccin inspired
 CATPPUCCIN_COLORS = {
@@ -29,6 +33,9 @@ CATPPUCCIN_COLORS = {
     "success": "#A6E3A1"   # Green
 }
 
+# Gap between pages in the PDF preview
+PAGE_SPACING = 20
+
 class ResumeATSApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -55,6 +62,17 @@ class ResumeATSApp(ctk.CTk):
         self.highest_score = 0
         self.highest_score_latex = ""
         self.current_project_dir = None  # Add this line
+        self.live_scorer = None  # only touched by live_jobs' worker
+        self.live_score_job = None
+        # Render, extract and score off the Tk thread, latest request wins
+        self.jobs = JobRunner(self, "render")
+        self.live_jobs = JobRunner(self, "live")
+        self.preview_jobs = JobRunner(self, "preview")
+        self.optimize_jobs = JobRunner(self, "optimize")
+        self.pdf_document = None
+        self.page_photos = {}  # page -> PhotoImage drawn on the preview canvas
+        self.preview_update_job = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Ensure API keys are available
         if not os.getenv("OPENROUTER_API_KEY"):
@@ -83,6 +101,8 @@ class ResumeATSApp(ctk.CTk):
                                                  fg=CATPPUCCIN_COLORS["fg"],
                                                  insertbackground=CATPPUCCIN_COLORS["accent"])
         self.md_editor.pack(fill="both", expand=True)
+        # Re-score live while typing, once the keyboard has been idle briefly
+        self.md_editor.bind("<KeyRelease>", self.schedule_live_score)
         
         # PDF tab
         self.pdf_tab = self.tab_view.add("Preview")
@@ -103,10 +123,14 @@ class ResumeATSApp(ctk.CTk):
             self.pdf_frame, 
             bg=CATPPUCCIN_COLORS["bg"],
             highlightthickness=0,
-            yscrollcommand=self.pdf_vscrollbar.set,
+            yscrollcommand=self.on_preview_scroll,
             xscrollcommand=self.pdf_hscrollbar.set
         )
         self.pdf_canvas.pack(side="left", fill="both", expand=True)
+        self.pdf_canvas.bind("<Configure>", self.on_preview_resize)
+        self.pdf_canvas.bind("<MouseWheel>", lambda e: self.pdf_canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.pdf_canvas.bind("<Button-4>", lambda e: self.pdf_canvas.yview_scroll(-1, "units"))
+        self.pdf_canvas.bind("<Button-5>", lambda e: self.pdf_canvas.yview_scroll(1, "units"))
         
         # Connect scrollbars to canvas
         self.pdf_vscrollbar.config(command=self.pdf_canvas.yview)
@@ -178,6 +202,15 @@ class ResumeATSApp(ctk.CTk):
         self.score_value = ctk.CTkLabel(self.score_frame, text="0%", font=("Arial", 16, "bold"))
         self.score_value.pack(side="left", padx=5)
         
+        self.live_score_value = ctk.CTkLabel(self.score_frame, text="Live: -")
+        self.live_score_value.pack(side="left", padx=10)
+        
+        # Fast scoring reads the markdown; fidelity scores the rendered PDF's text
+        self.fidelity_var = tk.BooleanVar(value=False)
+        self.fidelity_check = ctk.CTkCheckBox(self.score_frame, text="Fidelity check (score PDF text)",
+                                              variable=self.fidelity_var)
+        self.fidelity_check.pack(side="right", padx=5)
+        
         # Optimization buttons
         self.optimize_btn = ctk.CTkButton(self.right_frame, text="Score Resume",
                                          command=self.score_resume,
@@ -267,65 +300,32 @@ class ResumeATSApp(ctk.CTk):
             self.log("Please enter a company name")
             return
         
-        # Create projects directory if it doesn't exist
-        os.makedirs("projects", exist_ok=True)
-        
-        # Create company-specific directory (replace spaces with underscores)
-        safe_company_name = company_name.replace(" ", "_").replace("/", "_").replace("\\", "_")
-        project_dir = os.path.join("projects", safe_company_name)
+        store = get_project_store()
+        project_name = safe_project_name(company_name)
         
         # Check if project exists
-        if os.path.exists(project_dir):
+        if store.exists(project_name):
             # Ask for confirmation before overwriting
             if not messagebox.askyesno("Project exists", 
                                     f"Project for {company_name} already exists. Overwrite?"):
                 return
         
-        # Create project directory
-        os.makedirs(project_dir, exist_ok=True)
-        
         try:
-            # Save resume markdown
-            resume_content = self.md_editor.get(1.0, tk.END)
-            with open(os.path.join(project_dir, "resume.md"), "w") as f:
-                f.write(resume_content)
-            
-            # Save job description
-            job_desc = self.job_desc_text.get(1.0, tk.END)
-            with open(os.path.join(project_dir, "job_description.md"), "w") as f:
-                f.write(job_desc)
-            
-            # Save job URL
-            with open(os.path.join(project_dir, "job_url.txt"), "w") as f:
-                f.write(self.url_entry.get())
-            
-            # Save logs
-            log_content = self.log_text.get(1.0, tk.END)
-            with open(os.path.join(project_dir, "logs.txt"), "w") as f:
-                f.write(log_content)
-            
-            # Save score history
-            with open(os.path.join(project_dir, "score_history.json"), "w") as f:
-                json.dump({
-                    "current_score": self.current_score,
-                    "highest_score": self.highest_score,
-                    "score_chain": self.score_chain
-                }, f)
-            
-            # Save project metadata
-            project_meta = {
-                "company_name": company_name,
-                "date_created": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "date_modified": time.strftime("%Y-%m-%d %H:%M:%S")
-            }
-            with open(os.path.join(project_dir, "project_meta.json"), "w") as f:
-                json.dump(project_meta, f)
-            
-            # If we have a PDF, save it too
+            store.save(project_name, company_name, {
+                "resume": self.md_editor.get(1.0, tk.END),
+                "job_desc": self.job_desc_text.get(1.0, tk.END),
+                "job_url": self.url_entry.get(),
+                "logs": self.log_text.get(1.0, tk.END),
+                "current_score": self.current_score,
+                "highest_score": self.highest_score,
+                "score_history": self.score_chain
+            })
+            
+            # If we have a PDF, save it too (skipped when unchanged)
+            project_dir = store.project_dir(project_name)
             pdf_path = os.path.join(self.temp_dir, "resume.pdf")
             if os.path.exists(pdf_path):
-                import shutil
-                shutil.copy(pdf_path, os.path.join(project_dir, "resume.pdf"))
+                store.save_file(project_name, "resume.pdf", pdf_path)
             
             # Update current project info
             self.current_project_dir = project_dir
@@ -340,15 +340,10 @@ class ResumeATSApp(ctk.CTk):
 
     def load_project(self):
         # Get list of projects
-        if not os.path.exists("projects"):
-            os.makedirs("projects", exist_ok=True)
-            messagebox.showinfo("No Projects", "No projects directory found. Created projects directory.")
-            return
-        
-        project_dirs = [d for d in os.listdir("projects") 
-                    if os.path.isdir(os.path.join("projects", d))]
+        store = get_project_store()
+        projects = store.list_projects()
         
-        if not project_dirs:
+        if not projects:
             messagebox.showinfo("No Projects", "No projects found")
             return
         
@@ -366,20 +361,9 @@ class ResumeATSApp(ctk.CTk):
         
         # Populate list
         project_display_names = []
-        for dir_name in project_dirs:
-            # Try to get proper company name from metadata
-            meta_path = os.path.join("projects", dir_name, "project_meta.json")
-            if os.path.exists(meta_path):
-                try:
-                    with open(meta_path, "r") as f:
-                        meta = json.load(f)
-                        display_name = f"{meta['company_name']} (Created: {meta['date_created']})"
-                except:
-                    display_name = dir_name.replace("_", " ")
-            else:
-                display_name = dir_name.replace("_", " ")
-            
-            project_display_names.append((display_name, dir_name))
+        for project in projects:
+            display_name = f"{project['company_name']} (Created: {project['date_created']})"
+            project_display_names.append((display_name, project["name"]))
             projects_listbox.insert(tk.END, display_name)
         
         # Buttons
@@ -392,60 +376,32 @@ class ResumeATSApp(ctk.CTk):
             
             selected_idx = projects_listbox.curselection()[0]
             _, dir_name = project_display_names[selected_idx]
-            project_dir = os.path.join("projects", dir_name)
             
             try:
-                # Load resume
-                resume_path = os.path.join(project_dir, "resume.md")
-                if os.path.exists(resume_path):
-                    with open(resume_path, "r") as f:
-                        content = f.read()
-                        self.md_editor.delete(1.0, tk.END)
-                        self.md_editor.insert(tk.END, content)
-                
-                # Load job description
-                job_desc_path = os.path.join(project_dir, "job_description.md")
-                if os.path.exists(job_desc_path):
-                    with open(job_desc_path, "r") as f:
-                        content = f.read()
-                        self.job_desc_text.delete(1.0, tk.END)
-                        self.job_desc_text.insert(tk.END, content)
+                data = store.load(dir_name)
+                if data is None:
+                    raise ValueError(f"Project '{dir_name}' not found")
                 
-                # Load URL
-                url_path = os.path.join(project_dir, "job_url.txt")
-                if os.path.exists(url_path):
-                    with open(url_path, "r") as f:
-                        content = f.read().strip()
-                        self.url_entry.delete(0, tk.END)
-                        self.url_entry.insert(0, content)
+                self.md_editor.delete(1.0, tk.END)
+                self.md_editor.insert(tk.END, data["resume"])
+                self.job_desc_text.delete(1.0, tk.END)
+                self.job_desc_text.insert(tk.END, data["job_desc"])
+                self.url_entry.delete(0, tk.END)
+                self.url_entry.insert(0, data["job_url"])
+                self.log_text.delete(1.0, tk.END)
+                self.log_text.insert(tk.END, data["logs"])
                 
-                # Load logs
-                log_path = os.path.join(project_dir, "logs.txt")
-                if os.path.exists(log_path):
-                    with open(log_path, "r") as f:
-                        content = f.read()
-                        self.log_text.delete(1.0, tk.END)
-                        self.log_text.insert(tk.END, content)
+                self.current_score = data["current_score"]
+                self.highest_score = data["highest_score"]
+                self.score_chain = data["score_history"]
+                self.score_value.configure(text=f"{self.current_score}%")
                 
-                # Load score history
-                score_path = os.path.join(project_dir, "score_history.json")
-                if os.path.exists(score_path):
-                    with open(score_path, "r") as f:
-                        scores = json.load(f)
-                        self.current_score = scores.get("current_score", 0)
-                        self.highest_score = scores.get("highest_score", 0)
-                        self.score_chain = scores.get("score_chain", [0])
-                        self.score_value.configure(text=f"{self.current_score}%")
+                company_name = data["company_name"]
+                self.company_entry.delete(0, tk.END)
+                self.company_entry.insert(0, company_name)
+                self.project_info_label.configure(text=f"Current Project: {company_name}")
                 
-                # Load project metadata
-                meta_path = os.path.join(project_dir, "project_meta.json")
-                if os.path.exists(meta_path):
-                    with open(meta_path, "r") as f:
-                        meta = json.load(f)
-                        company_name = meta.get("company_name", dir_name.replace("_", " "))
-                        self.company_entry.delete(0, tk.END)
-                        self.company_entry.insert(0, company_name)
-                        self.project_info_label.configure(text=f"Current Project: {company_name}")
+                project_dir = store.project_dir(dir_name)
                 
                 # Set current project
                 self.current_project_dir = project_dir
@@ -516,70 +472,142 @@ class ResumeATSApp(ctk.CTk):
     
     def generate_pdf(self):
         content = self.md_editor.get(1.0, tk.END)
+        self.log("Generating PDF...")
+        
+        def render(token, content):
+            # Render in-process when WeasyPrint is available, pandoc otherwise
+            pdf_path = generate_pdf_from_markdown(content, self.temp_dir)
+            if not pdf_path:
+                raise RuntimeError("no PDF was produced")
+            return pdf_path
+        
+        self.jobs.submit("pdf", render, content,
+                         on_done=self._pdf_generated,
+                         on_error=lambda e: self.log(f"Error generating PDF: {e}"))
+    
+    def _pdf_generated(self, pdf_path):
+        self.log("PDF generated successfully")
+        self.display_pdf(pdf_path)
+    
+    def display_pdf(self, pdf_path):
+        # pdfinfo and hashing run on the worker; pages are rasterized on demand
+        self.preview_jobs.submit("open", lambda token: PdfDocument(pdf_path),
+                                 on_done=self.layout_pdf,
+                                 on_error=self._preview_failed)
+    
+    def preview_page_height(self):
+        """Pages are shown one viewport high"""
+        container_height = self.pdf_canvas.winfo_height()
+        if container_height <= 1:  # Not yet realized
+            container_height = 800  # Default fallback height
+        return max(100, container_height - PAGE_SPACING)
+    
+    def layout_pdf(self, document):
+        """Lay out placeholders for every page, then fill in the visible ones"""
+        # Re-laying out the same document (a resize) keeps the scroll position
+        scroll_top = self.pdf_canvas.yview()[0] if document is self.pdf_document else 0
+        self.pdf_document = document
+        self.preview_jobs.cancel("pages")
+        self.preview_jobs.cancel("prefetch")
+        self.pdf_canvas.delete("all")
+        self.page_photos = {}
+        
+        height = self.preview_height = self.preview_page_height()
+        width = document.page_width(height)
+        # Center the pages horizontally, at least 300px from the left
+        self.preview_x = max(width // 2, 300)
+        for page in range(1, document.page_count + 1):
+            top = (page - 1) * (height + PAGE_SPACING)
+            self.pdf_canvas.create_rectangle(
+                self.preview_x - width // 2, top, self.preview_x + width // 2, top + height,
+                outline=CATPPUCCIN_COLORS["border"]
+            )
         
-        # Save MD content to file
-        md_path = os.path.join(self.temp_dir, "resume.md")
-        with open(md_path, 'w') as f:
-            f.write(content)
-        
-        # Generate PDF using Pandoc
-        pdf_path = os.path.join(self.temp_dir, "resume.pdf")
-        cmd = ["pandoc", md_path, "-o", pdf_path, "--pdf-engine=weasyprint", "--css", "style.css"]
+        # Make the scrollregion wider than the pages to allow centering
+        total_height = document.page_count * (height + PAGE_SPACING)
+        self.pdf_canvas.config(scrollregion=(0, 0, max(width * 2, 600), total_height),
+                               yscrollincrement=height // 10)
+        self.pdf_canvas.yview_moveto(scroll_top)
+        self.update_visible_pages()
+    
+    def visible_page_range(self):
+        document = self.pdf_document
+        stride = self.preview_height + PAGE_SPACING
+        total_height = document.page_count * stride
+        top, bottom = self.pdf_canvas.yview()
+        first = int(top * total_height) // stride + 1
+        last = int(bottom * total_height) // stride + 1
+        return max(1, first), min(document.page_count, last)
+    
+    def on_preview_scroll(self, *args):
+        self.pdf_vscrollbar.set(*args)
+        # Coalesce the burst of scroll callbacks a drag produces
+        if self.pdf_document is not None and self.preview_update_job is None:
+            self.preview_update_job = self.after_idle(self.update_visible_pages)
+    
+    def on_preview_resize(self, event=None):
+        # A new height is a new zoom level: lay out again at the new size
+        if self.pdf_document is not None and self.preview_page_height() != self.preview_height:
+            self.layout_pdf(self.pdf_document)
+    
+    def update_visible_pages(self):
+        """Draw the pages in the viewport, rasterizing the missing ones, then prefetch"""
+        self.preview_update_job = None
+        document = self.pdf_document
+        if document is None:
+            return
+        height = self.preview_height
+        first, last = self.visible_page_range()
+        
+        # Keep only the pages near the viewport on the canvas
+        keep = range(first - PREFETCH_PAGES, last + PREFETCH_PAGES + 1)
+        for page in [p for p in self.page_photos if p not in keep]:
+            self.pdf_canvas.delete(f"page{page}")
+            del self.page_photos[page]
+        
+        missing = False
+        for page in range(first, last + 1):
+            image = document.cached(page, height)
+            if image is not None:
+                self.draw_page(page, image)
+            else:
+                missing = True
         
-        try:
-            subprocess.run(cmd, check=True)
-            self.display_pdf(pdf_path)
-            self.log("PDF generated successfully")
-        except subprocess.CalledProcessError as e:
-            self.log(f"Error generating PDF: {e}")
+        if missing:
+            self.preview_jobs.submit(
+                "pages", lambda token: document.render(first, last, height, token),
+                on_done=lambda pages: self._pages_ready(document, pages, first, last),
+                on_error=self._preview_failed
+            )
+        else:
+            self.prefetch_pages(document, first, last)
     
-    def display_pdf(self, pdf_path):
-        try:
-            # Clear existing content
-            self.pdf_canvas.delete("all")
-            
-            # Convert PDF to images
-            images = convert_from_path(pdf_path, dpi=150)
-            
-            # Store PhotoImage objects to prevent garbage collection
-            self.photo_images = []
-            total_height = 0
-            
-            # Get the height of the container
-            container_height = self.pdf_frame.winfo_height()
-            if container_height <= 1:  # Not yet realized
-                container_height = 800  # Default fallback height
-                
-            # Display each page with vertical spacing
-            spacing = 20
-            available_height = container_height - (len(images) - 1) * spacing
-            page_height = available_height // len(images)
-            
-            for img in images:
-                # Calculate scaling to fit page height
-                img_width, img_height = img.size
-                scale_factor = page_height / img_height
-                new_height = page_height
-                new_width = int(img_width * scale_factor)
-                
-                # Resize image to fit container height
-                resized_img = img.resize((new_width, new_height), Image.LANCZOS)
-                
-                photo = ImageTk.PhotoImage(resized_img)
-                self.photo_images.append(photo)
-                
-                # Center the image horizontally
-                x_position = max(new_width // 2, 300)  # At least 300px from left
-                
-                # Place image on canvas
-                self.pdf_canvas.create_image(x_position, total_height, anchor=tk.N, image=photo)
-                total_height += new_height + spacing
-            
-            # Update canvas scrollregion - make it wider than the widest image to allow centering
-            max_width = max(photo.width() for photo in self.photo_images) * 2
-            self.pdf_canvas.config(scrollregion=(0, 0, max_width, total_height))
-            
-        except ImportError:
+    def _pages_ready(self, document, pages, first, last):
+        if document is not self.pdf_document:
+            return
+        for page, image in pages.items():
+            if image.height == self.preview_height:
+                self.draw_page(page, image)
+        self.prefetch_pages(document, first, last)
+    
+    def prefetch_pages(self, document, first, last):
+        """Rasterize the neighbours of the viewport into the cache in the background"""
+        height = self.preview_height
+        neighbours = [p for p in list(range(first - PREFETCH_PAGES, first)) + list(range(last + 1, last + PREFETCH_PAGES + 1))
+                      if 1 <= p <= document.page_count and document.cached(p, height) is None]
+        if neighbours:
+            self.preview_jobs.submit("prefetch", lambda token: document.render(min(neighbours), max(neighbours), height, token))
+    
+    def draw_page(self, page, image):
+        if page in self.page_photos:
+            return
+        # Store PhotoImage objects to prevent garbage collection
+        photo = self.page_photos[page] = ImageTk.PhotoImage(image)
+        top = (page - 1) * (self.preview_height + PAGE_SPACING)
+        self.pdf_canvas.create_image(self.preview_x, top, anchor=tk.N, image=photo, tags=(f"page{page}",))
+    
+    def _preview_failed(self, error):
+        if isinstance(error, ImportError):
             self.log("Error: pdf2image module required. Install with: pip install pdf2image")
             self.pdf_canvas.create_text(
                 300, 200, 
@@ -590,8 +618,8 @@ class ResumeATSApp(ctk.CTk):
                     "- Windows: See pdf2image documentation",
                 fill=CATPPUCCIN_COLORS["fg"], width=500
             )
-        except Exception as e:
-            self.log(f"Error displaying PDF: {e}")
+        else:
+            self.log(f"Error displaying PDF: {error}")
     
     def fetch_job_description(self):
         url = self.url_entry.get()
@@ -603,25 +631,14 @@ class ResumeATSApp(ctk.CTk):
         
         def fetch():
             try:
-                response = requests.get(url)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Extract job description - first try common containers
-                    job_desc_containers = soup.select(".job-description, .description, [data-automation='jobDescription']")
-                    
-                    if job_desc_containers:
-                        text = job_desc_containers[0].get_text(separator="\n", strip=True)
-                    else:
-                        # Fallback: get all text and try to clean it up
-                        text = soup.get_text(separator="\n", strip=True)
-                    
+                success, content = fetch_job_description_from_url(url)
+                if success:
                     # Update UI in the main thread
                     self.after(0, lambda: self.job_desc_text.delete(1.0, tk.END))
-                    self.after(0, lambda: self.job_desc_text.insert(tk.END, text))
+                    self.after(0, lambda: self.job_desc_text.insert(tk.END, content))
                     self.after(0, lambda: self.log("Job description fetched successfully"))
                 else:
-                    self.after(0, lambda: self.log(f"Failed to fetch job description. Status code: {response.status_code}"))
+                    self.after(0, lambda: self.log(content))
             except Exception as e:
                 self.after(0, lambda: self.log(f"Error fetching job description: {e}"))
         
@@ -639,72 +656,101 @@ class ResumeATSApp(ctk.CTk):
             self.log("Please provide both resume content and job description")
             return
             
-        # Save files to temp directory
-        md_path = os.path.join(self.temp_dir, "resume.md")
-        with open(md_path, 'w') as f:
-            f.write(md_content)
-            
-        job_desc_path = os.path.join(self.temp_dir, "jobdesc.md")
-        with open(job_desc_path, 'w') as f:
-            f.write(job_desc)
-            
-        # Generate PDF
-        pdf_path = os.path.join(self.temp_dir, "resume.pdf")
-        cmd = ["pandoc", md_path, "-o", pdf_path, "--pdf-engine=weasyprint", "--css", "style.css"]
-        
-        try:
+        fidelity = self.fidelity_var.get()
+        if fidelity:
+            # Score the text a real ATS would pull out of the PDF
             self.log("Generating PDF...")
-            subprocess.run(cmd, check=True)
-            
-            # Extract text from PDF
-            subprocess.call(["pdftotext", pdf_path])
-            
-            # Read text content
-            with open(os.path.join(self.temp_dir, "resume.txt"), "r") as f:
-                resume_content = f.read()
+        project_name = os.path.basename(self.current_project_dir) if self.current_project_dir else None
+        self.jobs.submit("score", self._run_score, md_content, job_desc, fidelity, project_name,
+                         on_done=lambda result: self._score_ready(md_content, result),
+                         on_error=lambda e: self.log(f"Error scoring resume: {e}"))
+    
+    def _run_score(self, token, md_content, job_desc, fidelity, project_name):
+        """Worker side of score_resume: render if asked, extract, score and record"""
+        pdf_path = None
+        render_time = None
+        if fidelity:
+            start = time.perf_counter()
+            pdf_path = generate_pdf_from_markdown(md_content, self.temp_dir)
+            if not pdf_path:
+                raise RuntimeError("PDF generation failed")
+            render_time = time.perf_counter() - start
+            token.check()
+        
+        result = score_resume(pdf_path, md_content, job_desc, mode="fidelity" if fidelity else "fast")
+        if not result["success"]:
+            raise RuntimeError(result["message"])
+        if render_time is not None:
+            result["timings"] = {"render": render_time, **result["timings"]}
+        
+        # Keep every scored revision of a saved project
+        if project_name:
+            details = result["details"]
+            get_resume_history().record(project_name, md_content, result["score"])
+            score_log_for(project_name).append(
+                result["score"], details["skill_match_score"], details["document_similarity"]
+            )
+        return result
+    
+    def _score_ready(self, md_content, result):
+        score = result["score"]
+        extract_info = result["extraction"]
+        self.log(f"Scoring stages: {format_timings(result['timings'])}")
+        self.log(f"Text extraction ({extract_info['mode']}): {format_timings(extract_info['timings'])}")
+        if "text_drift" in extract_info:
+            self.log(f"Markdown vs PDF text drift: {extract_info['text_drift']:.1%}")
+        if "profile" in result:
+            self.log(f"Scoring profile:\n{result['profile']}")
+        
+        # Update score display
+        self.score_value.configure(text=f"{score}%")
+        self.current_score = score
+        
+        # Update score history
+        if not self.score_chain or self.score_chain[-1] != score:
+            self.score_chain.append(score)
+        
+        # Update highest score
+        if score > self.highest_score:
+            self.highest_score = score
+            self.highest_score_latex = md_content
+            with open(os.path.join(self.temp_dir, "temp/max/resume.md"), "w") as f:
+                f.write(md_content)
                 
-            # Score with ATS
-            ats = ATS()
-            ats.load_resume(resume_content)
-            ats.load_job_description(job_desc)
-            ats.clean_jd()
-            
-            experience = ats.extract_experience()
-            ats.clean_experience(experience)
-            
-            skills = " ".join(ats.extract_skills())
-            ats.clean_skills(skills)
-            
-            similarity_score = ats.calculate_detailed_score()
-            score = round(similarity_score["overall_score"] * 100, 2)
-            # score = similarity_score["overall_score"]
-            print(similarity_score)
-
-            # Update score display
-            self.score_value.configure(text=f"{score}%")
-            self.current_score = score
-            
-            # Update score history
-            if not self.score_chain or self.score_chain[-1] != score:
-                self.score_chain.append(score)
-            
-            # Update highest score
-            if score > self.highest_score:
-                self.highest_score = score
-                self.highest_score_latex = md_content
-                with open(os.path.join(self.temp_dir, "temp/max/resume.md"), "w") as f:
-                    f.write(md_content)
-                    
-                self.log(f"New highest score: {score}%")
-            
-            # Log result
-            self.log(f"Resume ATS score: {score}%")
-            
-            # Display PDF
-            self.display_pdf(pdf_path)
-            
-        except Exception as e:
-            self.log(f"Error scoring resume: {e}")
+            self.log(f"New highest score: {score}%")
+        
+        # Log result
+        self.log(f"Resume ATS score: {score}%")
+        
+        # Display PDF
+        if result["pdf_path"]:
+            self.display_pdf(result["pdf_path"])
+    
+    def schedule_live_score(self, event=None):
+        # Debounce: only the last keystroke in a burst triggers a score
+        if self.live_score_job is not None:
+            self.after_cancel(self.live_score_job)
+        # A live score still running was for older text; drop it
+        self.live_jobs.cancel("live")
+        self.live_score_job = self.after(150, self.live_score)
+    
+    def live_score(self):
+        self.live_score_job = None
+        md_content = self.md_editor.get(1.0, tk.END)
+        job_desc = self.job_desc_text.get(1.0, tk.END)
+        if not md_content.strip() or not job_desc.strip():
+            return
+        
+        self.live_jobs.submit("live", self._run_live_score, md_content, job_desc,
+                              on_done=lambda score: self.live_score_value.configure(text=f"Live: {score}%"),
+                              on_error=lambda e: self.log(f"Error in live scoring: {e}"))
+    
+    def _run_live_score(self, token, md_content, job_desc):
+        # Only the sections edited since the last score are re-scored
+        if self.live_scorer is None or self.live_scorer.job_desc != job_desc:
+            self.live_scorer = IncrementalScorer(job_desc)
+        result = self.live_scorer.update(md_content)
+        return round(result["overall_score"] * 100, 2)
     
     def auto_optimize(self):
         # Get content from editors
@@ -715,58 +761,53 @@ class ResumeATSApp(ctk.CTk):
             self.log("Please provide both resume content and job description")
             return
         
-        # First score the current resume    
-        self.score_resume()
-        
-        # Now start optimization thread
         self.log("Starting auto-optimization process...")
+        project_name = os.path.basename(self.current_project_dir) if self.current_project_dir else None
+        max_resume_path = os.path.join(self.temp_dir, "temp/max/resume.md")
+        
+        def on_best(text, score, result):
+            # Runs on the worker: keep the best so far even if the search is cut short
+            with open(max_resume_path, "w") as f:
+                f.write(text)
+            if project_name:
+                get_resume_history().record(project_name, text, score)
+                score_log_for(project_name).append(
+                    score, result["skill_match_score"], result["document_similarity"]
+                )
+            self.optimize_jobs.call_soon(self.log, f"New best: {score}%")
+        
+        def optimize(token):
+            return optimize_resume(
+                md_content, job_desc,
+                on_progress=lambda message: self.optimize_jobs.call_soon(self.log, message),
+                on_best=on_best,
+                should_stop=lambda: token.cancelled
+            )
         
-        def optimize_thread():
-            try:
-                # Save job description
-                with open(os.path.join(self.temp_dir, "jobdesc.md"), "w") as f:
-                    f.write(job_desc)
-
-                # Prepare command to run atsemu.py
-                cmd = [sys.executable, "atsemu.py", self.temp_dir]
-                
-                # Run the optimization process
-                self.log("Running atsemu.py optimization... (this will take several minutes)")
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-                
-                # Stream output to log
-                for line in process.stdout:
-                    self.after(0, lambda l=line: self.log(l.strip()))
-                
-                process.wait()
-                
-                # Check if optimization completed successfully
-                if process.returncode == 0:
-                    self.log("Optimization completed successfully")
-                    
-                    # Load the optimized resume if available
-                    max_resume_path = os.path.join(self.temp_dir, "temp/max/resume.md")
-                    if os.path.exists(max_resume_path):
-                        with open(max_resume_path, "r") as f:
-                            optimized_content = f.read()
-                            self.after(0, lambda: self.md_editor.delete(1.0, tk.END))
-                            self.after(0, lambda: self.md_editor.insert(tk.END, optimized_content))
-                        
-                        # Generate and display PDF
-                        self.after(0, self.generate_pdf)
-                        
-                        # Update score
-                        self.after(0, self.score_resume)
-                    else:
-                        self.log("Optimized resume not found")
-                else:
-                    self.log(f"Optimization failed with return code {process.returncode}")
-            
-            except Exception as e:
-                self.after(0, lambda: self.log(f"Optimization error: {e}"))
+        self.optimize_jobs.submit("optimize", optimize,
+                                  on_done=lambda result: self._optimize_done(result, md_content),
+                                  on_error=lambda e: self.log(f"Optimization error: {e}"))
+    
+    def _optimize_done(self, result, md_content):
+        if result["score"] <= result["baseline"]:
+            self.log("Optimization found nothing better")
+            return
+        self.log(f"Added skills: {', '.join(result['skills'])}")
+        
+        # The editor stays live during the search; don't overwrite edits made meanwhile
+        if self.md_editor.get(1.0, tk.END) != md_content:
+            if not messagebox.askyesno("Resume edited",
+                                       f"The resume was edited while optimizing. Replace it with the "
+                                       f"optimized version ({result['score']}%)? Your edits will be lost."):
+                self.log("Kept your edits; the optimized resume is saved in temp/max/resume.md")
+                return
         
-        # Run in a separate thread
-        thread = threading.Thread(target=optimize_thread)
+        # Load the optimized resume, then render and score it
+        self.md_editor.delete(1.0, tk.END)
+        self.md_editor.insert(tk.END, result["text"])
+        self.generate_pdf()
+        self.score_resume()
+    
     def _make_dialog_modal(self, dialog):
         """Helper method to safely make a dialog modal after it's visible"""
         try:
@@ -777,6 +818,13 @@ class ResumeATSApp(ctk.CTk):
         except Exception as e:
             self.log(f"Warning: Could not make dialog modal: {e}")
     
+    def on_close(self):
+        self.jobs.shutdown()
+        self.live_jobs.shutdown()
+        self.preview_jobs.shutdown()
+        self.optimize_jobs.shutdown()
+        self.destroy()
+    
     def log(self, message):
         self.log_text.insert(tk.END, message + "\n")
         self.log_text.see(tk.END)  # Auto-scroll to bottom
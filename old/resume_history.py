@@ -0,0 +1,258 @@
+"""
+Content-addressed version history of scored resumes.
+
+score_history.json only ever kept the scores, and the apps kept just the
+single best resume. ResumeHistory records every scored revision in the
+project database instead. Each distinct resume text is stored once, keyed
+by its SHA-256, so rescoring an unchanged resume or returning to an
+earlier one adds no content. A new text is stored as a line delta against
+the project's previous revision whenever that is smaller than the
+compressed full text, and as a full snapshot every MAX_DELTA_CHAIN deltas
+so a checkout never has to replay a long chain. Each version row points at
+an object and carries its score, which makes "revert to the best version"
+and diffs between any two versions cheap.
+"""
+import difflib
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from project_store import get_project_store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_objects (
+    hash TEXT PRIMARY KEY,
+    base TEXT REFERENCES resume_objects (hash),
+    depth INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_versions (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    object TEXT NOT NULL REFERENCES resume_objects (hash),
+    score REAL,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resume_versions_project ON resume_versions (project_id, id);
+CREATE INDEX IF NOT EXISTS resume_versions_score ON resume_versions (project_id, score);
+"""
+
+# Deltas allowed on top of a full snapshot before the next full one
+MAX_DELTA_CHAIN = 16
+# Reconstructed texts kept in memory; objects never change, so no invalidation
+TEXT_CACHE_SIZE = 64
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_delta(base_text, text):
+    """Line delta turning base_text into text: copy ranges of base lines, insert new ones"""
+    base_lines = base_text.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base_text, ops):
+    base_lines = base_text.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+class ResumeHistory:
+    """
+    Scored resume revisions per project.
+
+    One instance is shared by the apps' worker threads: each thread reads
+    through its own store connection, and the text cache and record() go
+    through a lock.
+
+    Args:
+        store: ProjectStore holding the projects (defaults to the shared one)
+    """
+
+    def __init__(self, store=None):
+        self.store = store or get_project_store()
+        self.store.connection().executescript(SCHEMA)
+        self._texts = OrderedDict()
+        # RLock: record() reads base texts through text()
+        self._lock = threading.RLock()
+
+    def _project_id(self, conn, project_name):
+        row = conn.execute("SELECT id FROM projects WHERE name = ?", (project_name,)).fetchone()
+        if row is None:
+            raise KeyError(f"Project '{project_name}' not found")
+        return row[0]
+
+    def _store_object(self, conn, digest, text, base_hash):
+        full = zlib.compress(text.encode("utf-8"), 9)
+        data, base, depth = full, None, 0
+        if base_hash is not None:
+            base_depth = conn.execute("SELECT depth FROM resume_objects WHERE hash = ?", (base_hash,)).fetchone()[0]
+            if base_depth < MAX_DELTA_CHAIN:
+                delta = zlib.compress(json.dumps(make_delta(self.text(base_hash), text)).encode("utf-8"), 9)
+                if len(delta) < len(full):
+                    data, base, depth = delta, base_hash, base_depth + 1
+        conn.execute(
+            "INSERT INTO resume_objects (hash, base, depth, size, data) VALUES (?, ?, ?, ?, ?)",
+            (digest, base, depth, len(text), data),
+        )
+
+    def record(self, project_name, resume_text, score=None):
+        """
+        Add a scored revision to a project's history.
+
+        Recording the same text with the same score as the latest version
+        is a no-op.
+
+        Returns:
+            Id of the version holding this revision
+        """
+        digest = content_hash(resume_text)
+        with self._lock, self.store.transaction() as conn:
+            project_id = self._project_id(conn, project_name)
+            latest = conn.execute(
+                "SELECT id, object, score FROM resume_versions WHERE project_id = ? ORDER BY id DESC LIMIT 1",
+                (project_id,),
+            ).fetchone()
+            if latest is not None and latest["object"] == digest and latest["score"] == score:
+                return latest["id"]
+            if conn.execute("SELECT 1 FROM resume_objects WHERE hash = ?", (digest,)).fetchone() is None:
+                self._store_object(conn, digest, resume_text, latest["object"] if latest else None)
+            return conn.execute(
+                "INSERT INTO resume_versions (project_id, object, score, created) VALUES (?, ?, ?, ?)",
+                (project_id, digest, score, time.strftime("%Y-%m-%d %H:%M:%S")),
+            ).lastrowid
+
+    def versions(self, project_name):
+        """
+        A project's revisions, newest first, without their text.
+
+        Returns:
+            List of dicts with id, hash, score, created and size
+        """
+        rows = self.store.connection().execute(
+            "SELECT v.id, v.object AS hash, v.score, v.created, o.size FROM resume_versions v"
+            " JOIN projects p ON p.id = v.project_id JOIN resume_objects o ON o.hash = v.object"
+            " WHERE p.name = ? ORDER BY v.id DESC",
+            (project_name,),
+        )
+        return [dict(row) for row in rows]
+
+    def best(self, project_name):
+        """The highest-scoring revision (the latest of any ties), or None"""
+        row = self.store.connection().execute(
+            "SELECT v.id, v.object AS hash, v.score, v.created FROM resume_versions v"
+            " JOIN projects p ON p.id = v.project_id WHERE p.name = ? AND v.score IS NOT NULL"
+            " ORDER BY v.score DESC, v.id DESC LIMIT 1",
+            (project_name,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def text(self, digest):
+        """Resume text of an object, replaying its delta chain if needed"""
+        with self._lock:
+            text = self._texts.get(digest)
+            if text is not None:
+                self._texts.move_to_end(digest)
+                return text
+        conn = self.store.connection()
+        chain = []
+        current = digest
+        # Walk back to a full snapshot (or a text already in memory)
+        while True:
+            with self._lock:
+                text = self._texts.get(current)
+            if text is not None:
+                break
+            row = conn.execute("SELECT base, data FROM resume_objects WHERE hash = ?", (current,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown resume object {current}")
+            data = zlib.decompress(row["data"]).decode("utf-8")
+            if row["base"] is None:
+                text = data
+                break
+            chain.append(json.loads(data))
+            current = row["base"]
+        for ops in reversed(chain):
+            text = apply_delta(text, ops)
+        with self._lock:
+            self._texts[digest] = text
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        return text
+
+    def checkout(self, version_id):
+        """Resume text of a version"""
+        row = self.store.connection().execute(
+            "SELECT object FROM resume_versions WHERE id = ?", (version_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown resume version {version_id}")
+        return self.text(row[0])
+
+    def diff(self, old_version_id, new_version_id, context=3):
+        """Unified diff between two versions"""
+        old = self.checkout(old_version_id).splitlines(keepends=True)
+        new = self.checkout(new_version_id).splitlines(keepends=True)
+        return "".join(difflib.unified_diff(
+            old, new, f"version {old_version_id}", f"version {new_version_id}", n=context
+        ))
+
+    def storage(self, project_name=None):
+        """
+        Bytes stored for resume text against what full copies would take.
+
+        Returns:
+            Dict with versions, objects, stored_bytes and full_copy_bytes
+        """
+        conn = self.store.connection()
+        where, args = "", ()
+        if project_name is not None:
+            where, args = " WHERE p.name = ?", (project_name,)
+        versions, full_copy_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(o.size), 0) FROM resume_versions v"
+            " JOIN projects p ON p.id = v.project_id JOIN resume_objects o ON o.hash = v.object" + where,
+            args,
+        ).fetchone()
+        objects, stored_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(o.data)), 0) FROM resume_objects o WHERE o.hash IN"
+            " (SELECT v.object FROM resume_versions v JOIN projects p ON p.id = v.project_id" + where + ")",
+            args,
+        ).fetchone()
+        return {
+            "versions": versions,
+            "objects": objects,
+            "stored_bytes": stored_bytes,
+            "full_copy_bytes": full_copy_bytes,
+        }
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_resume_history():
+    """Process-wide history on the shared project store"""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = ResumeHistory()
+        return _history
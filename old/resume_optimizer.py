@@ -0,0 +1,316 @@
+"""
+Beam-search resume optimizer.
+
+Auto-optimize used to shell out to atsemu.py, which is not part of the
+repo. optimize_resume() searches resume variants itself. A move adds one
+of the job's required skills that the resume is missing (the
+missing_skills of calculate_detailed_score) to an "Additional" line in
+the resume's skills section. Every generation expands each state in the
+beam by each skill it lacks, scores the new candidates and keeps the
+beam_width best. Candidates are scored by IncrementalScorer: a candidate
+differs from the one scored before it only in its skills section, so only
+that chunk is re-tokenized and re-matched. Large generations are split
+across worker processes that each keep their own scorer.
+
+The search is bounded. It adds at most max_insertions skills (past that it
+is keyword stuffing), scores at most max_candidates candidates, and stops
+when time_budget runs out, should_stop() says so or there is nothing left
+to add. Only the beam (skill tuples, not texts) and the skill sets already
+seen are kept. Progress goes to on_progress and every new best to on_best
+as the search runs, so callers can log it and save it to the project
+straight away.
+
+Each best candidate also has its bullets reordered, so that within each
+list the bullets naming the most required skills come first. The score is
+a bag of words and reordering leaves it unchanged, so it is applied to the
+winners rather than searched.
+"""
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from fast_scoring import prepare_job_description
+from incremental_scorer import IncrementalScorer
+from simple_ats import DEFAULT_SKILL_MATCHER
+from vocab_artifact import open_vocabulary
+
+ADDITIONAL_SKILLS_LABEL = "**Additional:**"
+
+# Generations smaller than this are scored in-process; starting workers costs more
+PARALLEL_MIN_CANDIDATES = 64
+
+_SKILLS_HEADING_RE = re.compile(r"(#{1,6})\s+.*skill", re.IGNORECASE)
+_HEADING_RE = re.compile(r"(#{1,6})(\s|$)")
+_BULLET_RE = re.compile(r"(\s*)([-*+]|\d+[.)])\s")
+_FENCE_RE = re.compile(r"\s*(```|~~~)")
+
+_State = namedtuple("_State", ["skills", "score"])
+
+# Per-worker scorer, set up by _init_worker
+_scorer = None
+
+
+def _matcher(vocab_path):
+    return open_vocabulary(vocab_path).matcher() if vocab_path else DEFAULT_SKILL_MATCHER
+
+
+def _init_worker(job_desc, vocab_path, jd_handle):
+    # Workers map the artifact themselves; a handle with an in-memory matcher is sent pickled
+    global _scorer
+    _scorer = IncrementalScorer(job_desc, _matcher(vocab_path), jd_handle)
+
+
+def _score_texts(texts):
+    return [_scorer.update(text)["overall_score"] for text in texts]
+
+
+def insert_skills(markdown_content, skills):
+    """
+    Add skills to the resume's skills section.
+
+    They go on one "- **Additional:** a, b" bullet after the last line of
+    the first section whose heading mentions skills. A resume without one
+    gets a "## Skills" section at the end.
+    """
+    if not skills:
+        return markdown_content
+    new_line = f"- {ADDITIONAL_SKILLS_LABEL} {', '.join(skills)}\n"
+    lines = markdown_content.splitlines(keepends=True)
+
+    start = level = None
+    for i, line in enumerate(lines):
+        match = _SKILLS_HEADING_RE.match(line)
+        if match:
+            start, level = i, len(match.group(1))
+            break
+    if start is None:
+        separator = "\n" if markdown_content and not markdown_content.endswith("\n") else ""
+        return f"{markdown_content}{separator}\n## Skills\n\n{new_line}"
+
+    end = len(lines)
+    for i in range(start + 1, len(lines)):
+        match = _HEADING_RE.match(lines[i])
+        if match and len(match.group(1)) <= level:
+            end = i
+            break
+    # Right after the section's last non-blank line
+    while end > start + 1 and not lines[end - 1].strip():
+        end -= 1
+    if not lines[end - 1].endswith("\n"):
+        lines[end - 1] += "\n"
+    lines.insert(end, new_line)
+    return "".join(lines)
+
+
+def order_bullets(markdown_content, skill_ids, matcher):
+    """
+    Within every list, move the bullets naming the most of skill_ids first.
+
+    The sort is stable, nested bullets and continuation lines move with
+    their parent, and the "Additional" skills bullet stays last.
+    """
+    lines = markdown_content.splitlines(keepends=True)
+    skill_ids = set(skill_ids)
+    out = []
+    i = 0
+    in_fence = False
+    while i < len(lines):
+        line = lines[i]
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else _BULLET_RE.match(line)
+        if match is None:
+            out.append(line)
+            i += 1
+            continue
+
+        # Collect the run of sibling bullets at this indent
+        indent = len(match.group(1))
+        items = []
+        while i < len(lines):
+            match = _BULLET_RE.match(lines[i])
+            if match is None or len(match.group(1)) != indent:
+                break
+            item = [lines[i]]
+            i += 1
+            while i < len(lines) and lines[i].strip():
+                nested = _BULLET_RE.match(lines[i])
+                continuation = len(lines[i]) - len(lines[i].lstrip()) > indent
+                if (nested and len(nested.group(1)) <= indent) or not (nested or continuation):
+                    break
+                item.append(lines[i])
+                i += 1
+            items.append(item)
+
+        def rank(item):
+            text = "".join(item)
+            if ADDITIONAL_SKILLS_LABEL in text:
+                return (1, 0)
+            return (0, -len(matcher.find_ids(text) & skill_ids))
+
+        for item in sorted(items, key=rank):
+            out.extend(item)
+    # The last item may have lost its newline by moving up
+    for k in range(len(out) - 1):
+        if not out[k].endswith("\n"):
+            out[k] += "\n"
+    return "".join(out)
+
+
+def optimize_resume(markdown_content, job_desc, beam_width=4, max_insertions=5, max_candidates=500,
+                    time_budget=30.0, max_workers=None, vocab_path=None, jd_handle=None,
+                    on_progress=None, on_best=None, should_stop=None):
+    """
+    Search for a higher-scoring variant of a resume.
+
+    Args:
+        markdown_content: The resume markdown
+        job_desc: The job description text
+        beam_width: States kept per generation
+        max_insertions: Most skills added to the resume
+        max_candidates: Most candidates scored in total
+        time_budget: Seconds after which no new generation is started
+            (and a running one stops collecting results)
+        max_workers: Worker processes for large generations (defaults to
+            the CPU count, at most 4; 1 scores everything in-process)
+        vocab_path: Compiled vocabulary artifact; ATS built-ins when None
+        jd_handle: fast_scoring.JobDescriptionHandle for job_desc, to skip
+            preparing it again (its matcher must come from vocab_path)
+        on_progress: Called with a progress message per generation
+        on_best: Called with (markdown, score, result) for every new best
+        should_stop: Polled between generations; return True to stop early
+
+    Returns:
+        Dict with text, score and baseline (percent), result (as
+        ATS.calculate_detailed_score), skills (those added), candidates,
+        generations, elapsed and stop_reason
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget
+    report = on_progress or (lambda message: None)
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+    jd = jd_handle or prepare_job_description(job_desc, _matcher(vocab_path))
+    matcher = jd.matcher
+
+    local = IncrementalScorer(job_desc, jd_handle=jd)
+    baseline = local.update(markdown_content)["overall_score"]
+    # Add skills the way the job description writes them
+    spellings = {}
+    for span_start, span_end, term_id in matcher.find_spans(job_desc):
+        spellings.setdefault(term_id, job_desc[span_start:span_end])
+    missing = [spellings.get(t, matcher.term(t)) for t in local.required if t not in local.skill_hits]
+    report(f"Baseline {baseline * 100:.2f}%, {len(missing)} required skill(s) missing")
+
+    def finish(state):
+        text = order_bullets(insert_skills(markdown_content, state.skills), local.required, matcher)
+        return text, local.update(text)
+
+    best = _State((), baseline)
+    beam = [best]
+    seen = {frozenset()}
+    scored = 0
+    generations = 0
+    stop_reason = "no missing skills" if not missing else "max insertions"
+    pool = None
+    try:
+        for generation in range(1, max_insertions + 1):
+            expansions = []
+            for state in beam:
+                for skill in missing:
+                    if skill in state.skills:
+                        continue
+                    key = frozenset(state.skills + (skill,))
+                    if key not in seen:
+                        seen.add(key)
+                        expansions.append(state.skills + (skill,))
+            expansions = expansions[:max_candidates - scored]
+            if not expansions:
+                if scored >= max_candidates:
+                    stop_reason = "candidate limit"
+                elif generation > 1:
+                    stop_reason = "all missing skills added"
+                break
+
+            texts = [insert_skills(markdown_content, skills) for skills in expansions]
+            if max_workers > 1 and len(texts) >= PARALLEL_MIN_CANDIDATES:
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                               initargs=(job_desc, vocab_path, None if vocab_path else jd))
+                scores = _score_parallel(pool, texts, max_workers, deadline)
+            else:
+                scores = []
+                for text in texts:
+                    if time.perf_counter() > deadline:
+                        break
+                    scores.append(local.update(text)["overall_score"])
+
+            candidates = [_State(skills, score) for skills, score in zip(expansions, scores)
+                          if score is not None]
+            scored += len(candidates)
+            generations = generation
+            if not candidates:
+                stop_reason = "time budget"
+                break
+            candidates.sort(key=lambda state: state.score, reverse=True)
+            beam = candidates[:beam_width]
+            if beam[0].score > best.score:
+                best = beam[0]
+                if on_best is not None:
+                    text, result = finish(best)
+                    on_best(text, round(result["overall_score"] * 100, 2), result)
+            report(f"Generation {generation}: scored {len(candidates)} candidate(s), "
+                   f"best {best.score * 100:.2f}% (+{', '.join(best.skills)})")
+
+            if time.perf_counter() > deadline:
+                stop_reason = "time budget"
+                break
+            if should_stop is not None and should_stop():
+                stop_reason = "stopped"
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    text, result = finish(best)
+    elapsed = time.perf_counter() - start
+    report(f"Optimization finished ({stop_reason}): {baseline * 100:.2f}% -> "
+           f"{result['overall_score'] * 100:.2f}% after {scored} candidate(s) in {elapsed:.1f}s")
+    return {
+        "text": text,
+        "score": round(result["overall_score"] * 100, 2),
+        "baseline": round(baseline * 100, 2),
+        "result": result,
+        "skills": list(best.skills),
+        "candidates": scored,
+        "generations": generations,
+        "elapsed": elapsed,
+        "stop_reason": stop_reason,
+    }
+
+
+def _score_parallel(pool, texts, max_workers, deadline):
+    """
+    Score texts across the pool, returning None for any left when time ran out.
+
+    Texts are sent in contiguous chunks so that candidates of the same
+    parent land on the same worker and share its incremental state.
+    """
+    chunk_size = max(1, -(-len(texts) // (2 * max_workers)))
+    futures = {}
+    for offset in range(0, len(texts), chunk_size):
+        futures[pool.submit(_score_texts, texts[offset:offset + chunk_size])] = offset
+    scores = [None] * len(texts)
+    pending = set(futures)
+    while pending:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            offset = futures[future]
+            scores[offset:offset + chunk_size] = future.result()
+    for future in pending:
+        future.cancel()
+    return scores
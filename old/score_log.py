@@ -0,0 +1,183 @@
+"""
+Append-only, fixed-width score log per project.
+
+Scores used to live in score_history.json (now the score_chain column):
+one growing list that was serialized and rewritten whole on every save,
+holding nothing but the overall score. ScoreLog keeps them in
+projects/<name>/scores.bin instead, as 20-byte records (timestamp as a
+float64, then overall, skill match and similarity as float32) behind a
+small header. Recording a score appends one record, whatever the length of
+the history. Reading maps the file with numpy.memmap and hands back a
+structured array over it, so opening a log costs the same however many
+scores it holds, and the chart and the cross-project queries only touch
+the columns they need.
+
+A crash mid-append can leave a partial record at the end. Readers ignore
+it and the next append overwrites it.
+"""
+import os
+import struct
+import time
+
+import numpy as np
+
+from project_store import get_project_store
+
+SCORE_LOG_NAME = "scores.bin"
+
+MAGIC = b"RMSCORE1"
+VERSION = 1
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("overall", "<f4"),
+    ("skill_match", "<f4"),
+    ("similarity", "<f4"),
+])
+
+_HEADER = struct.Struct("<8sII")
+_RECORD = struct.Struct("<dfff")
+assert _RECORD.size == RECORD_DTYPE.itemsize
+
+_EMPTY = np.zeros(0, dtype=RECORD_DTYPE)
+
+
+def _value(value):
+    return float("nan") if value is None else float(value)
+
+
+class ScoreLog:
+    """
+    The score log in one file.
+
+    Args:
+        path: The log file; created on the first append
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _check_header(self, f):
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return False
+        magic, version, record_size = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{self.path} is not a version {VERSION} score log")
+        return True
+
+    def __len__(self):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+        return max(0, (size - _HEADER.size) // RECORD_DTYPE.itemsize)
+
+    def append(self, overall, skill_match=None, similarity=None, timestamp=None):
+        """
+        Record one score.
+
+        Args:
+            overall: Overall score in percent
+            skill_match: Skill match fraction (None if unknown)
+            similarity: Document similarity fraction (None if unknown)
+            timestamp: Seconds since the epoch; now when None
+        """
+        record = _RECORD.pack(
+            time.time() if timestamp is None else float(timestamp),
+            _value(overall), _value(skill_match), _value(similarity),
+        )
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a+b") as f:
+            f.seek(0)
+            if not self._check_header(f):
+                f.truncate(0)
+                f.write(_HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+            # Drop a torn record left by a crash
+            end = _HEADER.size + len(self) * RECORD_DTYPE.itemsize
+            if f.seek(0, os.SEEK_END) != end:
+                f.truncate(end)
+            f.write(record)
+
+    def read(self):
+        """
+        Every record, oldest first, as a read-only structured array.
+
+        Returns:
+            numpy array of RECORD_DTYPE backed by the mapped file (empty
+            if there is no log yet)
+        """
+        count = len(self)
+        if not count:
+            return _EMPTY
+        with open(self.path, "rb") as f:
+            self._check_header(f)
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER.size, shape=(count,))
+
+    def best(self):
+        """The record with the highest overall score, or None"""
+        records = self.read()
+        if not len(records):
+            return None
+        return records[int(np.nanargmax(records["overall"]))]
+
+    def latest(self):
+        records = self.read()
+        return records[-1] if len(records) else None
+
+
+def score_log_path(project_name, store=None):
+    """Where a project's log lives, next to its binary artifacts; nothing is created"""
+    store = store or get_project_store()
+    return os.path.join(store.projects_dir, project_name, SCORE_LOG_NAME)
+
+
+def score_log_for(project_name, store=None):
+    """
+    ScoreLog of a project.
+
+    Only append() creates the project's directory, so reading the log of
+    a project that has none (or isn't saved yet) just finds it empty.
+    """
+    return ScoreLog(score_log_path(project_name, store))
+
+
+def project_summaries(store=None):
+    """
+    Score summary of every project that has a log.
+
+    Returns:
+        List of dicts with name, company_name, count, best, latest,
+        first and last (timestamps)
+    """
+    store = store or get_project_store()
+    summaries = []
+    for project in store.list_projects():
+        records = ScoreLog(score_log_path(project["name"], store)).read()
+        if not len(records):
+            continue
+        overall = records["overall"]
+        summaries.append({
+            "name": project["name"],
+            "company_name": project["company_name"],
+            "count": len(records),
+            "best": float(np.nanmax(overall)),
+            "latest": float(overall[-1]),
+            "first": float(records["timestamp"][0]),
+            "last": float(records["timestamp"][-1]),
+        })
+    return summaries
+
+
+def best_by_company(store=None):
+    """
+    Best score ever logged for each company.
+
+    Returns:
+        Dict of company name -> (best score, project name)
+    """
+    best = {}
+    for summary in project_summaries(store):
+        company = summary["company_name"]
+        if company not in best or summary["best"] > best[company][0]:
+            best[company] = (summary["best"], summary["name"])
+    return best
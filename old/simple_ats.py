@@ -1,13 +1,65 @@
+import re
+from collections import namedtuple
+from contextlib import nullcontext
+
 import nltk
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from skill_matcher import SkillMatcher
+
+# Technical skills commonly found in job descriptions
+TECH_SKILLS = [
+    'python', 'java', 'javascript', 'c++', 'c#', 'sql', 'nosql', 
+    'react', 'angular', 'vue', 'node', 'aws', 'azure', 'git',
+    'docker', 'kubernetes', 'machine learning', 'ai', 'data science',
+    'html', 'css', 'php', 'ruby', 'swift', 'kotlin', 'scala',
+    'mongodb', 'mysql', 'postgresql', 'oracle', 'rest', 'api',
+    'cloud', 'devops', 'ci/cd', 'agile', 'scrum', 'jira'
+]
+
+# Soft skills
+SOFT_SKILLS = [
+    'communication', 'teamwork', 'problem solving', 'problem-solving',
+    'leadership', 'time management', 'creativity', 'critical thinking',
+    'adaptability', 'collaboration', 'analytical', 'detail oriented',
+    'multitasking', 'organization', 'interpersonal'
+]
+
+# Compiled once at import, shared by every ATS instance
+DEFAULT_SKILL_MATCHER = SkillMatcher(TECH_SKILLS + SOFT_SKILLS)
+
+# Common section headers in job descriptions, highest priority first
+SECTION_HEADERS = [
+    "description", "about the role", "about the job", "overview",
+    "responsibilities", "duties", "what you'll do", "key responsibilities",
+    "requirements", "qualifications", "skills", "what you need", "required skills",
+    "experience", "education", "benefits", "perks", "what we offer"
+]
+_HEADER_PRIORITY = {header: i for i, header in enumerate(SECTION_HEADERS)}
+# Zero-width so every start position is tried; at each one the alternation
+# picks the highest priority header that starts there
+_HEADER_RE = re.compile("(?=(" + "|".join(re.escape(h) for h in SECTION_HEADERS) + "))")
+
+Section = namedtuple("Section", ["name", "start", "end"])
+
+def classify_section_header(line):
+    """Return the header a line announces, or None if it is not a header line"""
+    line_lower = line.lower().strip()
+    if len(line_lower) >= 50:  # Assuming headers are short
+        return None
+    found = [_HEADER_PRIORITY[m.group(1)] for m in _HEADER_RE.finditer(line_lower)]
+    return SECTION_HEADERS[min(found)] if found else None
 
 class ATS:
-    def __init__(self):
+    def __init__(self, skill_matcher=None, tfidf_cache=None):
         self.resume_content = ""
         self.job_description = ""
         self.vectorizer = TfidfVectorizer(stop_words='english')
+        # Pass a SkillMatcher built from cleaned.txt/keywords.txt to use a bigger vocabulary
+        self.skill_matcher = skill_matcher or DEFAULT_SKILL_MATCHER
+        # With a TfidfCache the job description is tokenized once and reused across scores
+        self.tfidf_cache = tfidf_cache
         
     def load_resume(self, content):
         self.resume_content = content
@@ -38,6 +90,8 @@ class ATS:
         
     def compute_similarity(self):
         # Calculate cosine similarity between resume and job description
+        if self.tfidf_cache is not None:
+            return self.tfidf_cache.similarity(self.resume_content, self.job_description)
         documents = [self.resume_content, self.job_description]
         try:
             tfidf_matrix = self.vectorizer.fit_transform(documents)
@@ -47,106 +101,91 @@ class ATS:
             return np.array([0.0])
     
     def identify_sections(self):
-        """Identify common sections in job descriptions"""
-        sections = {}
-        
-        # Common section headers in job descriptions
-        section_headers = [
-            "description", "about the role", "about the job", "overview",
-            "responsibilities", "duties", "what you'll do", "key responsibilities",
-            "requirements", "qualifications", "skills", "what you need", "required skills",
-            "experience", "education", "benefits", "perks", "what we offer"
-        ]
-        
-        lines = self.job_description.split('\n')
+        """
+        Identify common sections in job descriptions in one pass over the text.
+
+        Returns:
+            List of Section(name, start, end) tuples in document order. start
+            and end are offsets into self.job_description covering the lines
+            under the header (the header line itself is excluded). Text before
+            the first header is the "general" section, and a header that
+            appears twice gives two sections.
+        """
+        text = self.job_description
+        sections = []
         current_section = "general"
-        sections[current_section] = []
-        
-        for line in lines:
-            line_lower = line.lower().strip()
+        body_start = 0
+        line_start = 0
+        while True:
+            newline = text.find('\n', line_start)
+            line_end = len(text) if newline == -1 else newline
             
-            # Check if this line is a section header
-            is_header = False
-            for header in section_headers:
-                if header in line_lower and len(line_lower) < 50:  # Assuming headers are short
-                    current_section = header
-                    sections[current_section] = []
-                    is_header = True
-                    break
+            header = classify_section_header(text[line_start:line_end])
+            if header:
+                # The previous body ends at the newline before this header
+                sections.append(Section(current_section, body_start, max(body_start, line_start - 1)))
+                current_section = header
+                body_start = min(line_end + 1, len(text))
             
-            if not is_header:
-                sections[current_section].append(line)
-        
-        # Combine the lines in each section
-        for section in sections:
-            sections[section] = '\n'.join(sections[section])
+            if newline == -1:
+                break
+            line_start = newline + 1
         
+        sections.append(Section(current_section, body_start, len(text)))
         return sections
 
+    def section_text(self, name):
+        """Text of every section called name, joined in document order, or None"""
+        parts = [self.job_description[s.start:s.end] for s in self.identify_sections() if s.name == name]
+        return '\n'.join(parts) if parts else None
+
     def extract_skills_from_text(self, text):
         """Extract technical and soft skills from text using NLP"""
-        # Technical skills commonly found in job descriptions
-        tech_skills = [
-            'python', 'java', 'javascript', 'c++', 'c#', 'sql', 'nosql', 
-            'react', 'angular', 'vue', 'node', 'aws', 'azure', 'git',
-            'docker', 'kubernetes', 'machine learning', 'ai', 'data science',
-            'html', 'css', 'php', 'ruby', 'swift', 'kotlin', 'scala',
-            'mongodb', 'mysql', 'postgresql', 'oracle', 'rest', 'api',
-            'cloud', 'devops', 'ci/cd', 'agile', 'scrum', 'jira'
-        ]
-        
-        # Soft skills
-        soft_skills = [
-            'communication', 'teamwork', 'problem solving', 'problem-solving',
-            'leadership', 'time management', 'creativity', 'critical thinking',
-            'adaptability', 'collaboration', 'analytical', 'detail oriented',
-            'multitasking', 'organization', 'interpersonal'
-        ]
-
         # Call an LLM to extract through openrouter
 
-        found_skills = []
-        text_lower = text.lower()
-        
-        # Check for technical skills
-        for skill in tech_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        # Check for soft skills
-        for skill in soft_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return list(set(found_skills))  # Remove duplicates
+        return self.skill_matcher.find_skills(text)
 
-    def calculate_detailed_score(self):
-        """Calculate a detailed matching score between resume and job description"""
-        # Identify sections in the job description
-        jd_sections = self.identify_sections()
-        
+    def requirements_text(self):
+        """Text the required skills are read from: the requirements section if there is one"""
         # Extract skills from requirements section if available, otherwise from whole document
-        if 'requirements' in jd_sections:
-            jd_skills = self.extract_skills_from_text(jd_sections['requirements'])
-        else:
-            jd_skills = self.extract_skills_from_text(self.job_description)
-        print(f"Skills: {jd_skills}") 
-        # Extract skills from resume
-        resume_skills = self.extract_skills_from_text(self.resume_content)
-        
-        # Calculate skill match percentage
-        if len(jd_skills) > 0:
-            matched_skills = [skill for skill in jd_skills if skill in resume_skills]
-            skill_match_percentage = len(matched_skills) / len(jd_skills)
-        else:
-            matched_skills = []
-            skill_match_percentage = 0
-        
-        # Calculate missing skills
-        missing_skills = [skill for skill in jd_skills if skill not in resume_skills]
+        requirements = self.section_text('requirements')
+        if requirements is not None:
+            return requirements
+        return self.job_description
+
+    def calculate_detailed_score(self, timer=None):
+        """
+        Calculate a detailed matching score between resume and job description
+
+        Args:
+            timer: Optional profiling.StageTimer; the section split, skill
+                match and similarity steps are timed as stages of it
+        """
+        def stage(name):
+            return timer.stage(name) if timer is not None else nullcontext()
+        
+        with stage("section_split"):
+            requirements = self.requirements_text()
+        
+        with stage("skill_match"):
+            jd_skills = self.extract_skills_from_text(requirements)
+            # Extract skills from resume
+            resume_skills = self.extract_skills_from_text(self.resume_content)
+            
+            # Calculate skill match percentage
+            if len(jd_skills) > 0:
+                matched_skills = [skill for skill in jd_skills if skill in resume_skills]
+                skill_match_percentage = len(matched_skills) / len(jd_skills)
+            else:
+                matched_skills = []
+                skill_match_percentage = 0
+            
+            # Calculate missing skills
+            missing_skills = [skill for skill in jd_skills if skill not in resume_skills]
         
         # Calculate overall document similarity using TF-IDF
-        cosine_sim = self.compute_similarity()
+        with stage("similarity"):
+            cosine_sim = self.compute_similarity()
         
         # Calculate weighted score - more weight to skill matching than general document similarity
         overall_score = 0.7 * skill_match_percentage + 0.3 * cosine_sim
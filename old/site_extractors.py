@@ -0,0 +1,120 @@
+"""
+Registry of site-specific job-description extractors, keyed by hostname.
+
+The generic selector (html_extract.CONTAINER_SELECTOR) misses the
+description on most job boards, and the fallback is the whole page: nav,
+footers, similar-job lists and all, which costs TF-IDF time and adds noise
+to the score. Each board registered here gets its own container selectors,
+compiled once, plus cleanup rules (page chrome to leave out of the
+whole-page fallback, boilerplate lines to drop), applied in the same
+single streaming pass. A board's extractor still
+falls back to the generic selectors before giving up on a container.
+Unknown hosts get GENERIC_EXTRACTOR: the generic selectors, then schema.org
+markup, then <main>/<article>, and only then the page with its chrome
+(nav, footer, aside) left out, so a miss no longer means a whole-page dump.
+Skipping never applies inside a matched container, and never to <form> or
+<header>: ASP.NET boards wrap the whole page in a form, and some boards put
+the description inside a header.
+
+    register_extractor(Extractor("acme", containers=["#job-body"]), "jobs.acme.com")
+"""
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from html_extract import CONTAINER_SELECTOR, Extractor, extract_job_description
+
+# Boilerplate most boards put inside or right next to the description
+COMMON_DROP_LINES = [r"^Apply( now| for this job)?$", r"^Show (more|less)$", r"^Save( job)?$"]
+COMMON_SKIP = "button, nav"
+
+_registry = {}  # host suffix -> Extractor
+
+
+def register_extractor(extractor, *hosts):
+    """
+    Use extractor for pages on the given hosts.
+
+    A host also covers its subdomains: "myworkdayjobs.com" matches
+    "deere.wd5.myworkdayjobs.com". The longest registered suffix wins.
+    """
+    for host in hosts:
+        _registry[host.lower().lstrip(".")] = extractor
+    extractor_for_host.cache_clear()
+
+
+@lru_cache(maxsize=1024)
+def extractor_for_host(host):
+    """Extractor registered for host or its closest parent domain"""
+    host = host.lower().split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        extractor = _registry.get(".".join(labels[i:]))
+        if extractor is not None:
+            return extractor
+    return GENERIC_EXTRACTOR
+
+
+def extractor_for_url(url):
+    return extractor_for_host(urlsplit(url).netloc) if url else GENERIC_EXTRACTOR
+
+
+def extract_for_url(html, url, backend=None):
+    """
+    Extract a posting's description with the extractor for its host.
+
+    Args:
+        html: The page HTML
+        url: The URL it came from (None for GENERIC_EXTRACTOR)
+        backend: Parser backend, see html_extract.extract_job_description
+
+    Returns:
+        The description text
+    """
+    return extract_job_description(html, backend, extractor_for_url(url))
+
+
+GENERIC_EXTRACTOR = Extractor(
+    "generic",
+    [".job-description", "[data-automation=jobDescription]", ".description",
+     "[itemprop=description]", "main", "article"],
+    skip=COMMON_SKIP + ", footer, aside",
+    drop_lines=COMMON_DROP_LINES,
+)
+
+
+def _site(name, *containers, skip=None, drop_lines=()):
+    skip = ", ".join(s for s in (COMMON_SKIP, skip) if s)
+    return Extractor(name, list(containers) + [CONTAINER_SELECTOR], skip,
+                     COMMON_DROP_LINES + list(drop_lines))
+
+
+register_extractor(
+    _site("workday",
+          "[data-automation-id=jobPostingDescription]",
+          "[data-automation=jobDescription]"),
+    "myworkdayjobs.com", "myworkdaysite.com",
+)
+register_extractor(
+    _site("greenhouse", ".job__description", "#content",
+          drop_lines=[r"^Powered by Greenhouse$"]),
+    "greenhouse.io",
+)
+register_extractor(
+    _site("lever", "[data-qa=job-description]", ".posting-page",
+          drop_lines=[r"^Jobs powered by Lever$"]),
+    "lever.co",
+)
+register_extractor(
+    _site("linkedin", ".show-more-less-html__markup", ".description__text"),
+    "linkedin.com",
+)
+register_extractor(
+    _site("indeed", "#jobDescriptionText"),
+    "indeed.com",
+)
+register_extractor(
+    _site("smartrecruiters", "[itemprop=description]", ".job-sections"),
+    "smartrecruiters.com",
+)
@@ -0,0 +1,203 @@
+import re
+from collections import deque
+
+
+def normalize_term(term):
+    """Lowercase a term and collapse runs of whitespace to single spaces"""
+    return " ".join(term.lower().split())
+
+
+def load_vocabulary(path):
+    """
+    Load a newline separated keyword file such as cleaned.txt or keywords.txt.
+
+    Args:
+        path: Path to the keyword file
+
+    Returns:
+        List of normalized, de-duplicated terms in file order
+    """
+    with open(path, "r") as f:
+        terms = [normalize_term(line) for line in f]
+    return list(dict.fromkeys(t for t in terms if t))
+
+
+def _strip_description(term):
+    # cleaned.txt entries look like "Janus (concurrent constraint ...)" or
+    # "PowerBuilder – 4GL GUI applcation generator from Sybase"
+    term = re.sub(r"\s*\([^)]*\)", "", normalize_term(term))
+    return normalize_term(re.split(r"\s+[–—]\s+", term)[0])
+
+
+def canonical_term(term):
+    """
+    Reduce a vocabulary entry to the form it is matched and reported under.
+
+    Drops trailing descriptions ("Janus (...)" -> "janus") and spells
+    hyphens as spaces the way getdata.py does.
+    """
+    return normalize_term(_strip_description(term).replace("-", " "))
+
+
+def build_aliases(raw_terms):
+    """
+    Group raw vocabulary entries under their canonical term.
+
+    Args:
+        raw_terms: Iterable of vocabulary entries
+
+    Returns:
+        Tuple of (terms, aliases) where terms lists the canonical terms in
+        first-seen order and aliases maps every other spelling worth matching
+        (e.g. "problem-solving") to its canonical term
+    """
+    terms = {}
+    aliases = {}
+    for raw in raw_terms:
+        canon = canonical_term(raw)
+        if not canon:
+            continue
+        terms.setdefault(canon, None)
+        spelled = _strip_description(raw)
+        if spelled != canon:
+            aliases.setdefault(spelled, canon)
+    aliases = {alias: canon for alias, canon in aliases.items() if alias not in terms}
+    return list(terms), aliases
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+# Characters that continue a language name: "c" must not match in "c++" or "c#"
+_NAME_SUFFIX_CHARS = "+#"
+
+
+def _at_boundary(text, start, end):
+    """True if text[start:end] is not glued to a word on either side"""
+    if end < len(text) and _is_word_char(text[end - 1]) and (
+            _is_word_char(text[end]) or text[end] in _NAME_SUFFIX_CHARS):
+        return False
+    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+        return False
+    return True
+
+
+class MatcherBase:
+    """Shared lookups for matchers that implement find_spans() and term()"""
+
+    def find_ids(self, text):
+        """Return the set of term ids found in text"""
+        return {term_id for _, _, term_id in self.find_spans(text)}
+
+    def find_skills(self, text):
+        """
+        Find the distinct vocabulary terms present in text.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            List of matched terms in order of first appearance
+        """
+        seen = {}
+        for _, _, term_id in self.find_spans(text):
+            seen.setdefault(term_id, None)
+        return [self.term(term_id) for term_id in seen]
+
+
+class SkillMatcher(MatcherBase):
+    """
+    Aho-Corasick automaton over a skill vocabulary.
+
+    The automaton is compiled once in the constructor and every call to
+    find_skills() is a single pass over the text, no matter how many terms
+    the vocabulary holds. A match only counts when it is not glued to a
+    neighbouring word character, so "ai" does not fire inside "maintain"
+    while "c++" and "ci/cd" still match as written.
+
+    Matches are reported by term id. Aliases are extra spellings that match
+    like their canonical term and report its id.
+    """
+
+    def __init__(self, terms, aliases=None):
+        # Keep the first spelling of every normalized term
+        self.terms = list(dict.fromkeys(t for t in (normalize_term(t) for t in terms) if t))
+        term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+
+        # Patterns are the terms followed by their aliases
+        self.patterns = list(self.terms)
+        self.pattern_terms = list(range(len(self.terms)))
+        for alias, term in (aliases or {}).items():
+            alias = normalize_term(alias)
+            if alias and alias not in term_ids and normalize_term(term) in term_ids:
+                term_ids[alias] = term_ids[normalize_term(term)]
+                self.patterns.append(alias)
+                self.pattern_terms.append(term_ids[alias])
+        self.lengths = [len(p) for p in self.patterns]
+
+        # goto[state] maps a character to the next state
+        self.goto = [{}]
+        # out[state] holds the ids of patterns that end exactly at this state
+        self.out = [[]]
+        for pattern_id, term in enumerate(self.patterns):
+            state = 0
+            for ch in term:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pattern_id)
+
+        # Breadth first pass to wire failure links and merge outputs
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                if self.out[self.fail[nxt]]:
+                    self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def term(self, term_id):
+        return self.terms[term_id]
+
+    def find_spans(self, text):
+        """
+        Find every vocabulary term in text.
+
+        Args:
+            text: The text to scan (case is ignored)
+
+        Returns:
+            List of (start, end, term_id) tuples in order of their end offset
+        """
+        text = text.lower()
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        lengths = self.lengths
+        pattern_terms = self.pattern_terms
+        spans = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for pattern_id in out[state]:
+                start = i + 1 - lengths[pattern_id]
+                if _at_boundary(text, start, i + 1):
+                    spans.append((start, i + 1, pattern_terms[pattern_id]))
+        return spans
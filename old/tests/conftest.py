@@ -0,0 +1,59 @@
+import os
+import shutil
+import subprocess
+import sys
+from html.parser import HTMLParser
+
+import pytest
+
+OLD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules live flat in old/ and import each other by bare name
+sys.path.insert(0, OLD_DIR)
+
+RESUME_TEMPLATE = os.path.join(OLD_DIR, "resumeTemplate.md")
+
+_BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "ul", "ol", "table", "tr", "th", "td",
+               "div", "br", "hr", "blockquote", "pre"}
+
+
+class _VisibleText(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def visible_lines(html):
+    """Visible text of an HTML fragment, one line per block or table cell"""
+    parser = _VisibleText()
+    parser.feed(html)
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).split("\n"))
+    return [line for line in lines if line]
+
+
+@pytest.fixture
+def resume_template():
+    with open(RESUME_TEMPLATE, "r") as f:
+        return f.read()
+
+
+@pytest.fixture
+def pandoc_html():
+    """Markdown to HTML with pandoc, as pdf_generator.render_with_pandoc reads it"""
+    if shutil.which("pandoc") is None:
+        pytest.skip("pandoc is not installed")
+
+    def convert(markdown_content):
+        return subprocess.run(["pandoc", "-f", "markdown", "-t", "html", "--wrap=none"],
+                              input=markdown_content, capture_output=True, text=True, check=True).stdout
+    return convert
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+
+import bulk_fetcher
+
+POSTING = '<html><body><nav>Jobs</nav><div class="job-description"><p>We need Python.</p></div></body></html>'
+
+
+async def fetch_all(urls, **kwargs):
+    app = web.Application()
+
+    async def posting(request):
+        return web.Response(text=POSTING, content_type="text/html")
+
+    async def slow(request):
+        await asyncio.sleep(2)
+        return web.Response(text=POSTING, content_type="text/html")
+
+    app.router.add_get("/posting", posting)
+    app.router.add_get("/broken", posting)
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        urls = [url.format(base=f"http://127.0.0.1:{port}") for url in urls]
+        results = {result.url: result async for result in bulk_fetcher.fetch_many(urls, **kwargs)}
+        return [results[url] for url in urls]
+    finally:
+        await runner.cleanup()
+
+
+def test_each_failure_stays_with_its_url(monkeypatch):
+    extract = bulk_fetcher.extract_for_url
+
+    def extract_or_fail(html, url):
+        if url.endswith("/broken"):
+            raise RuntimeError("extractor blew up")
+        return extract(html, url)
+
+    monkeypatch.setattr(bulk_fetcher, "extract_for_url", extract_or_fail)
+    urls = ["{base}/posting", "{base}/missing", "{base}/broken", "{base}/slow", "http://[bad"]
+    results = asyncio.run(fetch_all(urls, timeout=0.5, retries=1, backoff=0.01, rate_per_host=None))
+
+    ok, missing, broken, slow, bad = results
+    assert ok.success and ok.text == "We need Python."
+    # A 404 isn't retried
+    assert not missing.success and missing.status == 404 and missing.attempts == 1
+    assert not broken.success and "extractor blew up" in broken.text and broken.attempts == 1
+    # Timeouts are retried, then reported
+    assert not slow.success and slow.status is None and slow.attempts == 2
+    assert not bad.success and bad.url == "http://[bad" and bad.attempts == 1
+
+
+def test_invalid_url_is_not_retried():
+    result, = asyncio.run(fetch_all(["example.com/no-scheme"], retries=3, backoff=10))
+    assert not result.success and result.attempts == 1 and "Invalid" in result.text
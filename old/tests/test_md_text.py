@@ -0,0 +1,22 @@
+from conftest import visible_lines
+from md_text import markdown_to_text
+
+
+def test_bullets_after_table_are_their_own_lines():
+    text = markdown_to_text("| **Panda POS** - *Team Project* | 10/2024 |\n|:-|-:|\n"
+                            "- Engineered a POS system\n- Implemented a Node.js backend\n")
+    assert text.split("\n") == ["Panda POS - Team Project", "10/2024",
+                                "Engineered a POS system", "Implemented a Node.js backend"]
+
+
+def test_template_keeps_bullets_out_of_tables(resume_template):
+    lines = markdown_to_text(resume_template).split("\n")
+    heading = lines.index("Personal Website - Full Stack Web Development, Self Led")
+    assert lines[heading + 1] == "06/2024"
+    assert lines[heading + 2].startswith("Optimized blog performance")
+    assert "08/2024 – Present" in lines
+    assert not any(line.startswith("- ") for line in lines)
+
+
+def test_template_matches_pandoc_text(resume_template, pandoc_html):
+    assert markdown_to_text(resume_template).split("\n") == visible_lines(pandoc_html(resume_template))
@@ -0,0 +1,69 @@
+import os
+
+import markdown
+
+import pdf_generator
+from conftest import visible_lines
+from md_text import markdown_extensions
+
+TABLE_THEN_BULLETS = """| **Personal Website** - *Self Led* | 06/2024 |
+|:-|-:|
+- Optimized load times -- a *66% improvement*
+- Engineered a "scalable" backend...
+"""
+
+
+def render_html(markdown_content):
+    # What WeasyPrintRenderer lays out
+    return markdown.markdown(markdown_content, extensions=markdown_extensions())
+
+
+def test_bullets_after_table_stay_a_list():
+    html = render_html(TABLE_THEN_BULLETS)
+    assert "<td>" not in html
+    assert html.count("<li>") == 2
+    assert visible_lines(html)[-2:] == ["Optimized load times – a 66% improvement",
+                                        "Engineered a “scalable” backend…"]
+
+
+def test_template_matches_pandoc(resume_template, pandoc_html):
+    assert visible_lines(render_html(resume_template)) == visible_lines(pandoc_html(resume_template))
+
+
+def test_pdf_is_replaced_whole(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen = []
+
+    def fake_pandoc(md_path, pdf_path, css_path="style.css"):
+        # The previous PDF stays in place until the new one is complete
+        seen.append(open(tmp_path / "out" / "resume.pdf", "rb").read())
+        assert pdf_path.endswith(".pdf") and pdf_path != str(tmp_path / "out" / "resume.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-new")
+
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "resume.pdf").write_bytes(b"%PDF-old")
+    monkeypatch.setattr(pdf_generator, "render_with_pandoc", fake_pandoc)
+
+    pdf_path = pdf_generator.generate_pdf_from_markdown("# Jane", str(tmp_path / "out"), backend="pandoc")
+
+    assert seen == [b"%PDF-old"]
+    assert open(pdf_path, "rb").read() == b"%PDF-new"
+    assert sorted(os.listdir(tmp_path / "out")) == ["resume.md", "resume.pdf"]
+
+
+def test_failed_render_keeps_previous_pdf(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def broken_pandoc(md_path, pdf_path, css_path="style.css"):
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-half")
+        raise RuntimeError("pandoc crashed")
+
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "resume.pdf").write_bytes(b"%PDF-old")
+    monkeypatch.setattr(pdf_generator, "render_with_pandoc", broken_pandoc)
+
+    assert pdf_generator.generate_pdf_from_markdown("# Jane", str(tmp_path / "out"), backend="pandoc") is None
+    assert (tmp_path / "out" / "resume.pdf").read_bytes() == b"%PDF-old"
+    assert sorted(os.listdir(tmp_path / "out")) == ["resume.md", "resume.pdf"]
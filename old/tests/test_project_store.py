@@ -0,0 +1,68 @@
+from project_store import ProjectStore
+
+
+def make_store(tmp_path):
+    return ProjectStore(str(tmp_path / "projects.db"), str(tmp_path / "projects"))
+
+
+def test_partial_save_keeps_other_fields(tmp_path):
+    store = make_store(tmp_path)
+    store.save("Acme", "Acme", {
+        "resume": "# Jane\n",
+        "job_desc": "Python",
+        "job_url": "https://jobs.example.com/1",
+        "logs": "scored 42%\n",
+        "current_score": 42,
+        "highest_score": 42,
+        "score_history": [0, 42],
+    })
+
+    # What app.py's Save Project passes
+    changed = store.save("Acme", "Acme", {
+        "resume": "# Jane Doe\n",
+        "job_desc": "Python",
+        "current_score": 50,
+        "highest_score": 50,
+        "score_history": [0, 42, 50],
+    })
+
+    data = store.load("Acme")
+    assert sorted(changed) == ["current_score", "highest_score", "resume", "score_chain"]
+    assert data["resume"] == "# Jane Doe\n"
+    assert data["score_history"] == [0, 42, 50]
+    assert data["logs"] == "scored 42%\n"
+    assert data["job_url"] == "https://jobs.example.com/1"
+
+
+def test_new_project_gets_defaults(tmp_path):
+    store = make_store(tmp_path)
+    store.save("Acme", "Acme", {"resume": "# Jane\n"})
+
+    data = store.load("Acme")
+    assert data["logs"] == ""
+    assert data["job_url"] == ""
+    assert data["score_history"] == [0]
+
+
+def test_unchanged_save_writes_nothing(tmp_path):
+    store = make_store(tmp_path)
+    project = {"resume": "# Jane\n", "job_desc": "Python"}
+    store.save("Acme", "Acme", project)
+    assert store.save("Acme", "Acme", project) == []
+
+
+def test_first_open_imports_project_folders(tmp_path):
+    project = tmp_path / "projects" / "Acme_Corp"
+    project.mkdir(parents=True)
+    (project / "resume.md").write_text("# Jane\n")
+    (project / "job_description.md").write_text("Python")
+    (project / "job_url.txt").write_text("https://jobs.example.com/1\n")
+    (project / "score_history.json").write_text('{"current_score": 40, "highest_score": 45, "score_chain": [0, 45, 40]}')
+    (project / "project_meta.json").write_text('{"company_name": "Acme Corp", "date_created": "2025-01-02 03:04:05"}')
+
+    data = make_store(tmp_path).load("Acme_Corp")
+    assert data["company_name"] == "Acme Corp"
+    assert data["resume"] == "# Jane\n"
+    assert data["job_url"] == "https://jobs.example.com/1"
+    assert data["score_history"] == [0, 45, 40]
+    assert data["date_created"] == "2025-01-02 03:04:05"
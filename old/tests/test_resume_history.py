@@ -0,0 +1,48 @@
+import threading
+
+import resume_history
+from project_store import ProjectStore
+from resume_history import ResumeHistory
+
+
+def make_history(tmp_path, names=("Acme",)):
+    store = ProjectStore(str(tmp_path / "projects.db"), str(tmp_path / "projects"))
+    for name in names:
+        store.save(name, name, {"resume": ""})
+    return ResumeHistory(store)
+
+
+def test_checkout_replays_deltas(tmp_path):
+    history = make_history(tmp_path)
+    texts = [f"# Jane\n\n## Skills\n\n- Python\n" + "".join(f"- Skill {i}\n" for i in range(n)) for n in range(20)]
+    ids = [history.record("Acme", text, score=n) for n, text in enumerate(texts)]
+
+    fresh = ResumeHistory(history.store)
+    assert [fresh.checkout(i) for i in ids] == texts
+    assert history.best("Acme")["id"] == ids[-1]
+
+
+def test_shared_instance_across_threads(tmp_path, monkeypatch):
+    names = [f"Project{i}" for i in range(4)]
+    history = make_history(tmp_path, names)
+    monkeypatch.setattr(resume_history, "TEXT_CACHE_SIZE", 4)
+    errors = []
+
+    def work(name):
+        try:
+            for n in range(40):
+                text = f"# {name}\n" + "".join(f"- line {i}\n" for i in range(n))
+                version = history.record(name, text, score=n)
+                assert history.checkout(version) == text
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(history._texts) <= 4
+    assert all(len(history.versions(name)) == 40 for name in names)
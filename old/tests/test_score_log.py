@@ -0,0 +1,37 @@
+import math
+import os
+
+from project_store import ProjectStore
+from score_log import best_by_company, score_log_for
+
+
+def make_store(tmp_path):
+    return ProjectStore(str(tmp_path / "projects.db"), str(tmp_path / "projects"))
+
+
+def test_reading_creates_nothing(tmp_path):
+    store = make_store(tmp_path)
+    log = score_log_for("Not_Saved_Yet", store)
+
+    assert len(log) == 0
+    assert len(log.read()) == 0
+    assert not os.path.exists(tmp_path / "projects" / "Not_Saved_Yet")
+
+
+def test_append_creates_log_and_survives_torn_record(tmp_path):
+    store = make_store(tmp_path)
+    store.save("Acme", "Acme Corp", {"resume": ""})
+    log = score_log_for("Acme", store)
+    log.append(40.0, 0.5, 0.2, timestamp=1)
+    log.append(55.5, timestamp=2)
+    with open(log.path, "ab") as f:
+        f.write(b"\x00" * 7)  # crash mid-append
+
+    records = log.read()
+    assert len(log) == 2
+    assert list(records["overall"]) == [40.0, 55.5]
+    assert math.isnan(records["skill_match"][1])
+
+    log.append(50.0, timestamp=3)
+    assert list(log.read()["overall"]) == [40.0, 55.5, 50.0]
+    assert best_by_company(store) == {"Acme Corp": (55.5, "Acme")}
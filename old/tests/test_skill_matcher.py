@@ -0,0 +1,21 @@
+from skill_matcher import SkillMatcher
+
+TERMS = ["c", "c++", "c#", "f#", "f", "java", "javascript", "machine learning"]
+
+
+def found(text):
+    matcher = SkillMatcher(TERMS)
+    return sorted(matcher.term(t) for t in matcher.find_ids(text))
+
+
+def test_c_does_not_match_inside_cpp_or_csharp():
+    assert found("Experience with C++ and C#.") == ["c#", "c++"]
+
+
+def test_language_names_at_boundaries():
+    assert found("C, C++/C#; F# and F") == ["c", "c#", "c++", "f", "f#"]
+    assert found("#java developer") == ["java"]
+
+
+def test_terms_are_not_matched_inside_words():
+    assert found("JavaScript, Javanese, machine learning.") == ["javascript", "machine learning"]
@@ -0,0 +1,32 @@
+from skill_matcher import SkillMatcher
+from vocab_artifact import MappedSkillMatcher, VocabArtifact, build_artifact
+
+TERMS = ["python", "java", "javascript", "machine learning", "sql", "docker"]
+
+
+def mapped_matcher(tmp_path):
+    source = tmp_path / "keywords.txt"
+    source.write_text("\n".join(TERMS) + "\n")
+    build_artifact([str(source)], str(tmp_path / "skills.vocab"))
+    return MappedSkillMatcher(VocabArtifact(str(tmp_path / "skills.vocab")))
+
+
+def test_memo_stays_bounded_within_one_text(tmp_path, monkeypatch):
+    matcher = mapped_matcher(tmp_path)
+    monkeypatch.setattr(MappedSkillMatcher, "MAX_MEMO", 50)
+    text = " ".join(f"{chr(0x4e00 + i)} python" for i in range(500))
+
+    spans = matcher.find_spans(text)
+
+    assert len(matcher._memo) <= 50
+    assert len(spans) == 500
+
+
+def test_matches_in_memory_matcher(tmp_path):
+    mapped = mapped_matcher(tmp_path)
+    in_memory = SkillMatcher(TERMS)
+    text = "Python, Java and JavaScript; machine learning with SQL in Docker."
+
+    found = sorted(mapped.term(t) for t in mapped.find_ids(text))
+    assert found == sorted(in_memory.term(t) for t in in_memory.find_ids(text))
+    assert len(found) == len(TERMS)
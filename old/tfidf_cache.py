@@ -0,0 +1,128 @@
+"""
+Cached job-description side of ATS.compute_similarity.
+
+ATS.compute_similarity fits a TfidfVectorizer on [resume, job description]
+and takes the cosine of the two rows. With only two documents the fitted
+state is tiny: a term's idf is 1 when both documents contain it and
+ln(3/2) + 1 when only one does, and the vectors are l2-normalized term
+counts. So the job description only needs tokenizing once. After that the
+exact same cosine can be computed from the resume's term counts alone.
+"""
+import hashlib
+import math
+import sys
+from collections import Counter, OrderedDict
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# smooth_idf over a two document corpus: ln((1 + n) / (1 + df)) + 1
+IDF_SHARED = 1.0
+IDF_SINGLE = math.log(3 / 2) + 1
+
+# Same tokenizer ATS.vectorizer uses, so cached and uncached scores agree
+_analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+
+
+def term_counts(text):
+    """Tokenize text the way ATS.vectorizer does and count the terms"""
+    return Counter(_analyzer(text))
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JobDescriptionTerms:
+    """Tokenized job description, ready to be compared with many resumes"""
+
+    def __init__(self, text):
+        self.counts = term_counts(text)
+        # Sum of squared counts; the job vector's norm is derived from it
+        self.sq_sum = sum(c * c for c in self.counts.values())
+
+    def nbytes(self):
+        """Rough memory footprint, used for the cache budget"""
+        size = sys.getsizeof(self.counts)
+        for term in self.counts:
+            size += sys.getsizeof(term) + 28
+        return size
+
+
+def pair_cosine(resume_counts, jd_terms):
+    """
+    Cosine similarity of the two-document TF-IDF fit, from term counts.
+
+    Args:
+        resume_counts: Mapping of term -> count for the resume
+        jd_terms: JobDescriptionTerms for the job description
+
+    Returns:
+        Float in [0, 1], equal to ATS.compute_similarity on the same texts
+    """
+    jd_counts = jd_terms.counts
+    dot = 0.0
+    resume_sq = 0.0
+    shared_jd_sq = 0.0
+    for term, count in resume_counts.items():
+        jd_count = jd_counts.get(term)
+        if jd_count:
+            dot += count * jd_count
+            resume_sq += count * count
+            shared_jd_sq += jd_count * jd_count
+        else:
+            resume_sq += count * count * IDF_SINGLE ** 2
+    jd_sq = IDF_SINGLE ** 2 * jd_terms.sq_sum - (IDF_SINGLE ** 2 - IDF_SHARED) * shared_jd_sq
+    if not dot or not resume_sq or not jd_sq:
+        return 0.0
+    return dot / math.sqrt(resume_sq * jd_sq)
+
+
+class TfidfCache:
+    """
+    LRU cache of tokenized job descriptions keyed by content hash.
+
+    Args:
+        max_bytes: Approximate memory budget for cached job descriptions
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, job_desc):
+        """Return the JobDescriptionTerms for job_desc, tokenizing it on a miss"""
+        key = content_hash(job_desc)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        jd_terms = JobDescriptionTerms(job_desc)
+        size = jd_terms.nbytes()
+        self._entries[key] = (jd_terms, size)
+        self.nbytes += size
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+        return jd_terms
+
+    def similarity(self, resume_text, job_desc):
+        """Cosine similarity between a resume and a (cached) job description"""
+        return pair_cosine(term_counts(resume_text), self.get(job_desc))
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+# Shared by the apps' score-edit-score loops
+JD_TFIDF_CACHE = TfidfCache()
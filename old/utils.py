@@ -1,7 +1,21 @@
 import os
+import json
+import time
+import hashlib
 import tempfile
+import threading
 import requests
-from bs4 import BeautifulSoup
+from site_extractors import extract_for_url
+
+# Fetched postings: raw body, extracted text and validators, keyed by URL
+FETCH_CACHE_DIR = ".fetch_cache"
+FETCH_CACHE_MAX_BYTES = 50 * 1024 * 1024
+# Entries younger than this are served without touching the network
+FETCH_CACHE_TTL = 6 * 60 * 60
+# Bump when the extractors change so cached text is re-extracted
+EXTRACTOR_VERSION = 3
+
+_http = threading.local()
 
 def setup_temp_dir():
     """Create and set up a temporary directory structure"""
@@ -10,32 +24,181 @@ def setup_temp_dir():
     os.makedirs(os.path.join(temp_dir, "temp/max"), exist_ok=True)
     return temp_dir
 
-def fetch_job_description_from_url(url):
+def _get_session():
+    """Per-thread requests session, so repeat fetches reuse connections"""
+    session = getattr(_http, "session", None)
+    if session is None:
+        session = _http.session = requests.Session()
+    return session
+
+def _fetch_cache_paths(url, cache_dir=FETCH_CACHE_DIR):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = os.path.join(cache_dir, key)
+    return base + ".json", base + ".html"
+
+def _write_atomic(path, data):
+    # Write then rename so readers never see a half-written entry
+    tmp_path = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def load_cached_posting(url, cache_dir=FETCH_CACHE_DIR):
+    """
+    Read a cached posting.
+    
+    Returns:
+        Tuple of (entry, body) or (None, None) when not cached. entry holds
+        url, etag, last_modified, checked_at, extractor and text
+    """
+    meta_path, body_path = _fetch_cache_paths(url, cache_dir)
+    try:
+        with open(meta_path, "r") as f:
+            entry = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if entry.get("url") != url:
+        return None, None
+    return entry, body
+
+def store_cached_posting(entry, body=None, cache_dir=FETCH_CACHE_DIR):
+    """Write a cache entry; body is left as it is when None"""
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path, body_path = _fetch_cache_paths(entry["url"], cache_dir)
+    if body is not None:
+        _write_atomic(body_path, body)
+    else:
+        try:
+            os.utime(body_path)  # mark as recently used
+        except OSError:
+            pass
+    _write_atomic(meta_path, json.dumps(entry).encode("utf-8"))
+
+def evict_fetch_cache(cache_dir=FETCH_CACHE_DIR, max_bytes=FETCH_CACHE_MAX_BYTES):
+    """Delete least recently used postings until the cache fits in max_bytes"""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = {}
+    for name in os.listdir(cache_dir):
+        key, ext = os.path.splitext(name)
+        if ext not in (".json", ".html"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        mtime, size, paths = entries.get(key, (0, 0, []))
+        entries[key] = (max(mtime, stat.st_mtime), size + stat.st_size, paths + [path])
+    total = sum(size for _, size, _ in entries.values())
+    for _, size, paths in sorted(entries.values()):
+        if total <= max_bytes:
+            break
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+
+def fetch_posting(url, use_cache=True, max_age=FETCH_CACHE_TTL, cache_dir=FETCH_CACHE_DIR, timeout=20):
+    """
+    Fetch and extract a job posting, going through the on-disk HTTP cache.
+    
+    Entries younger than max_age are returned as they are. Older ones are
+    revalidated with a conditional GET (If-None-Match / If-Modified-Since);
+    a 304 reuses the cached text without parsing anything.
+    
+    Args:
+        url: The URL to fetch from
+        use_cache: Read and write the cache
+        max_age: Seconds a cached entry is trusted without revalidating;
+            0 always revalidates, which is how saved postings are re-checked
+        cache_dir: Cache directory
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Tuple of (success, content/error_message, info) where info has
+        'source' ("cache", "not_modified" or "network"), 'status' and
+        'changed' (whether the text differs from the cached copy)
+    """
+    entry, body = load_cached_posting(url, cache_dir) if use_cache else (None, None)
+    info = {"source": "network", "status": None, "changed": True}
+    
+    if entry is not None and entry.get("extractor") != EXTRACTOR_VERSION:
+        # Extractor changed since this was cached: re-extract the stored body
+        entry["text"] = extract_for_url(body.decode("utf-8", errors="replace"), url)
+        entry["extractor"] = EXTRACTOR_VERSION
+        if entry["text"].strip():
+            store_cached_posting(entry, cache_dir=cache_dir)
+        else:
+            # Nothing usable in the stored page; fetch it again
+            entry = body = None
+    
+    if entry is not None and time.time() - entry.get("checked_at", 0) < max_age:
+        info.update(source="cache", changed=False)
+        return True, entry["text"], info
+    
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    
+    try:
+        response = _get_session().get(url, headers=headers, timeout=timeout)
+    except Exception as e:
+        return False, f"Error fetching job description: {e}", info
+    info["status"] = response.status_code
+    
+    if response.status_code == 304 and entry is not None:
+        entry["checked_at"] = time.time()
+        store_cached_posting(entry, cache_dir=cache_dir)
+        info.update(source="not_modified", changed=False)
+        return True, entry["text"], info
+    
+    if response.status_code != 200:
+        return False, f"Failed to fetch job description. Status code: {response.status_code}", info
+    
+    if entry is not None and response.content == body:
+        # Server ignored the validators but nothing changed
+        text = entry["text"]
+        info["changed"] = False
+    else:
+        text = extract_for_url(response.text, url)
+        if not text.strip():
+            return False, "No job description text found on the page", info
+        info["changed"] = entry is None or text != entry["text"]
+    
+    if use_cache:
+        store_cached_posting({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": time.time(),
+            "extractor": EXTRACTOR_VERSION,
+            "text": text,
+        }, response.content, cache_dir)
+        evict_fetch_cache(cache_dir)
+    return True, text, info
+
+def fetch_job_description_from_url(url, use_cache=True, max_age=FETCH_CACHE_TTL):
     """
     Fetch job description from a URL.
     
     Args:
         url: The URL to fetch from
+        use_cache: Go through the on-disk HTTP cache (see fetch_posting)
+        max_age: Seconds a cached posting is trusted without revalidating
         
     Returns:
         Tuple of (success, content/error_message)
     """
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract job description - first try common containers
-            job_desc_containers = soup.select(".job-description, .description, [data-automation='jobDescription']")
-            
-            if job_desc_containers:
-                text = job_desc_containers[0].get_text(separator="\n", strip=True)
-            else:
-                # Fallback: get all text and try to clean it up
-                text = soup.get_text(separator="\n", strip=True)
-            
-            return True, text
-        else:
-            return False, f"Failed to fetch job description. Status code: {response.status_code}"
+        success, content, _ = fetch_posting(url, use_cache, max_age)
+        return success, content
     except Exception as e:
         return False, f"Error fetching job description: {e}"
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Compiled skill vocabulary artifact.
+
+clean.py and getdata.py produce newline separated keyword lists. This module
+compiles those lists once into a flat binary file holding an interned string
+table, the canonical (normalized) term for every raw entry, the alias
+spellings, and the SkillMatcher automaton laid out as arrays. Scorers mmap
+the file and walk it in place, so opening it costs the same no matter how big
+the vocabulary is and every process that maps it shares the same pages.
+
+Usage:
+    python vocab_artifact.py cleaned.vocab cleaned.txt [more.txt ...]
+"""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+from skill_matcher import MatcherBase, SkillMatcher, build_aliases, canonical_term, _at_boundary
+
+MAGIC = b"RMVOCAB1"
+VERSION = 1
+
+# raw_term value for entries that normalize to nothing
+NO_TERM = 0xFFFFFFFF
+
+# Every section is a flat array of unsigned 32-bit ints, except string_blob
+SECTIONS = [
+    "string_offsets",  # n_strings + 1 byte offsets into string_blob
+    "string_blob",     # utf-8 text of every interned string
+    "raw_string",      # per raw entry: string id of the entry as written
+    "raw_term",        # per raw entry: id of its canonical term, or NO_TERM
+    "term_string",     # per canonical term: string id of the normalized form
+    "pattern_string",  # per automaton pattern: string id
+    "pattern_term",    # per automaton pattern: canonical term id
+    "pattern_len",     # per automaton pattern: length in characters
+    "edge_start",      # per node + 1: first index into edge_char/edge_target
+    "edge_char",       # code point of each edge, sorted within a node
+    "edge_target",     # destination node of each edge
+    "node_fail",       # per node: failure link
+    "out_start",       # per node + 1: first index into out_pattern
+    "out_pattern",     # pattern ids emitted at each node
+]
+
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<QQ")
+
+
+def _u32(values):
+    arr = array("I", values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def build_artifact(source_paths, out_path):
+    """
+    Compile keyword files into a binary vocabulary artifact.
+
+    Args:
+        source_paths: Keyword files to merge, one term per line
+        out_path: Where to write the artifact
+
+    Returns:
+        Number of canonical terms in the artifact
+    """
+    raw_entries = []
+    for path in source_paths:
+        with open(path, "r") as f:
+            raw_entries.extend(line.strip() for line in f)
+    raw_entries = list(dict.fromkeys(e for e in raw_entries if e))
+
+    terms, aliases = build_aliases(raw_entries)
+    matcher = SkillMatcher(terms, aliases)
+    term_ids = {term: term_id for term_id, term in enumerate(matcher.terms)}
+
+    strings = {}
+
+    def intern(s):
+        return strings.setdefault(s, len(strings))
+
+    raw_string = [intern(e) for e in raw_entries]
+    raw_term = [term_ids.get(canonical_term(e), NO_TERM) for e in raw_entries]
+    term_string = [intern(t) for t in matcher.terms]
+    pattern_string = [intern(p) for p in matcher.patterns]
+
+    blob = bytearray()
+    string_offsets = [0]
+    for s in strings:
+        blob += s.encode("utf-8")
+        string_offsets.append(len(blob))
+
+    edge_start = [0]
+    edge_char = []
+    edge_target = []
+    out_start = [0]
+    out_pattern = []
+    for state, edges in enumerate(matcher.goto):
+        for ch in sorted(edges):
+            edge_char.append(ord(ch))
+            edge_target.append(edges[ch])
+        edge_start.append(len(edge_char))
+        out_pattern.extend(matcher.out[state])
+        out_start.append(len(out_pattern))
+
+    payloads = {
+        "string_offsets": _u32(string_offsets),
+        "string_blob": bytes(blob),
+        "raw_string": _u32(raw_string),
+        "raw_term": _u32(raw_term),
+        "term_string": _u32(term_string),
+        "pattern_string": _u32(pattern_string),
+        "pattern_term": _u32(matcher.pattern_terms),
+        "pattern_len": _u32(matcher.lengths),
+        "edge_start": _u32(edge_start),
+        "edge_char": _u32(edge_char),
+        "edge_target": _u32(edge_target),
+        "node_fail": _u32(matcher.fail),
+        "out_start": _u32(out_start),
+        "out_pattern": _u32(out_pattern),
+    }
+
+    # Sections start on 8 byte boundaries so they can be cast in place
+    offset = _HEADER.size + _ENTRY.size * len(SECTIONS)
+    directory = []
+    body = bytearray()
+    for name in SECTIONS:
+        pad = -(offset + len(body)) % 8
+        body += b"\0" * pad
+        directory.append((offset + len(body), len(payloads[name])))
+        body += payloads[name]
+
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(SECTIONS)))
+        for entry in directory:
+            f.write(_ENTRY.pack(*entry))
+        f.write(body)
+
+    return len(matcher.terms)
+
+
+class VocabArtifact:
+    """
+    Read-only view over a compiled vocabulary artifact.
+
+    Nothing is parsed on open: every section is a memoryview cast over the
+    mapped file, and strings are decoded only when asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder != "little":
+            raise ValueError("Vocabulary artifacts are little-endian only")
+
+        magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or count != len(SECTIONS):
+            raise ValueError(f"{path} is not a version {VERSION} vocabulary artifact")
+
+        view = memoryview(self._mmap)
+        for i, name in enumerate(SECTIONS):
+            offset, length = _ENTRY.unpack_from(self._mmap, _HEADER.size + i * _ENTRY.size)
+            section = view[offset:offset + length]
+            setattr(self, name, section if name == "string_blob" else section.cast("I"))
+
+    def string(self, string_id):
+        start = self.string_offsets[string_id]
+        end = self.string_offsets[string_id + 1]
+        return bytes(self.string_blob[start:end]).decode("utf-8")
+
+    def __len__(self):
+        return len(self.term_string)
+
+    def term(self, term_id):
+        """Normalized form of a canonical term"""
+        return self.string(self.term_string[term_id])
+
+    def raw_entries(self):
+        """Yield (raw entry, canonical term id) for every source line"""
+        for raw_id, string_id in enumerate(self.raw_string):
+            yield self.string(string_id), self.raw_term[raw_id]
+
+    def matcher(self):
+        return MappedSkillMatcher(self)
+
+
+class _TermList:
+    """Sequence of canonical terms decoded on access"""
+
+    def __init__(self, artifact):
+        self._artifact = artifact
+
+    def __len__(self):
+        return len(self._artifact)
+
+    def __getitem__(self, term_id):
+        return self._artifact.term(term_id)
+
+
+class MappedSkillMatcher(MatcherBase):
+    """
+    SkillMatcher that walks the automaton stored in a VocabArtifact.
+
+    Transitions are resolved against the mapped arrays the first time they
+    are taken and remembered in a bounded dict, so repeated scans run at
+    the speed of the in-memory SkillMatcher without decoding the whole
+    automaton up front.
+
+    The memo is private to each process, so it is kept small: text keeps
+    revisiting the same shallow states, and 64k entries (about 15 MB)
+    hold the hot ones while the automaton itself stays shared in the map.
+    """
+
+    MAX_MEMO = 1 << 16
+
+    def __init__(self, artifact):
+        self.artifact = artifact
+        self.terms = _TermList(artifact)
+        # (state, char) -> (next state, ((pattern length, term id), ...))
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.artifact)
+
+    def term(self, term_id):
+        return self.artifact.term(term_id)
+
+    def _step(self, state, ch):
+        a = self.artifact
+        edge_start, edge_char = a.edge_start, a.edge_char
+        code = ord(ch)
+        while True:
+            lo = edge_start[state]
+            hi = edge_start[state + 1]
+            j = bisect_left(edge_char, code, lo, hi)
+            if j < hi and edge_char[j] == code:
+                state = a.edge_target[j]
+                break
+            if not state:
+                break
+            state = a.node_fail[state]
+        outputs = tuple(
+            (a.pattern_len[a.out_pattern[k]], a.pattern_term[a.out_pattern[k]])
+            for k in range(a.out_start[state], a.out_start[state + 1])
+        )
+        return state, outputs
+
+    def find_spans(self, text):
+        """
+        Find every vocabulary term in text.
+
+        Args:
+            text: The text to scan (case is ignored)
+
+        Returns:
+            List of (start, end, term_id) tuples in order of their end offset
+        """
+        memo = self._memo
+        text = text.lower()
+        spans = []
+        state = 0
+        for i, ch in enumerate(text):
+            step = memo.get((state, ch))
+            if step is None:
+                # Checked per miss, so one long text can't grow it either
+                if len(memo) >= self.MAX_MEMO:
+                    memo.clear()
+                step = memo[(state, ch)] = self._step(state, ch)
+            state, outputs = step
+            for length, term_id in outputs:
+                start = i + 1 - length
+                if _at_boundary(text, start, i + 1):
+                    spans.append((start, i + 1, term_id))
+        return spans
+
+
+@lru_cache(maxsize=None)
+def open_vocabulary(path):
+    """Map an artifact once per process and hand back the shared view"""
+    return VocabArtifact(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    count = build_artifact(sys.argv[2:], sys.argv[1])
+    print(f"wrote {count} terms to {sys.argv[1]}")